@@ -0,0 +1,200 @@
+"""
+基准测试公共工具：加载插件模块、生成检索结果样本、统计耗时
+
+插件依赖 MoviePilot 的 app 包，运行前需通过 --moviepilot 参数或 MOVIEPILOT_PATH 环境变量指定 MoviePilot 源码目录
+"""
+import argparse
+import importlib.util
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+PLUGINS_DIR = Path(__file__).resolve().parent.parent / "plugins.v2"
+
+
+def add_common_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--moviepilot", default=os.environ.get("MOVIEPILOT_PATH"),
+                        help="MoviePilot 源码目录，默认读取 MOVIEPILOT_PATH 环境变量")
+    parser.add_argument("--repeat", type=int, default=5, help="每项测试重复次数")
+
+
+def load_plugin(name: str, moviepilot: Optional[str] = None):
+    """
+    按文件路径加载插件模块
+    :param name: 插件目录名，如 jackettextend
+    :param moviepilot: MoviePilot 源码目录
+    """
+    if moviepilot and moviepilot not in sys.path:
+        sys.path.insert(0, moviepilot)
+    if name in sys.modules:
+        return sys.modules[name]
+    plugin_dir = PLUGINS_DIR / name
+    spec = importlib.util.spec_from_file_location(name, plugin_dir / "__init__.py",
+                                                  submodule_search_locations=[str(plugin_dir)])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except ImportError as e:
+        sys.modules.pop(name, None)
+        raise SystemExit(f"无法加载插件 {name}：{e}，请通过 --moviepilot 指定 MoviePilot 源码目录")
+    return module
+
+
+def prowlarr_release(i: int, indexer_id: int = 1) -> Dict[str, Any]:
+    """
+    生成一条与 Prowlarr /api/v1/search 返回格式一致的检索结果
+    """
+    return {
+        "guid": f"https://tracker.example/details.php?id={100000 + i}",
+        "age": i % 900,
+        "ageHours": (i % 900) * 24.0,
+        "ageMinutes": (i % 900) * 1440.0,
+        "size": 1073741824 + i * 4096,
+        "files": 1 + i % 40,
+        "grabs": i % 500,
+        "indexerId": indexer_id,
+        "indexer": f"Tracker {indexer_id}",
+        "title": f"Example.Movie.{2000 + i % 25}.2160p.WEB-DL.DDP5.1.Atmos.H.265-GROUP{i}",
+        "sortTitle": f"example movie {2000 + i % 25} 2160p web dl ddp5 1 atmos h 265 group{i}",
+        "imdbId": 1000000 + i,
+        "tmdbId": 2000 + i,
+        "tvdbId": 0,
+        "tvMazeId": 0,
+        "publishDate": "2024-01-01T00:00:00Z",
+        "downloadUrl": f"http://127.0.0.1:9696/{indexer_id}/download?link=abcdef{i}&file=Example.Movie",
+        "infoUrl": f"https://tracker.example/details.php?id={100000 + i}",
+        "indexerFlags": ["freeleech"] if i % 3 == 0 else [],
+        "categories": [{"id": 2000, "name": "Movies", "subCategories": [{"id": 2045, "name": "Movies/UHD"}]}],
+        "seeders": i % 300,
+        "leechers": i % 50,
+        "protocol": "torrent",
+        "infoHash": f"{i:040x}",
+        "fileName": f"Example.Movie.{i}.torrent",
+    }
+
+
+def prowlarr_response(size: int, indexers: int = 1, ids: Optional[List[int]] = None) -> bytes:
+    """
+    生成包含 size 条结果的 Prowlarr 检索响应，结果轮流归属 ids 中的索引器，未指定时为 1..indexers
+    """
+    ids = ids or list(range(1, max(indexers, 1) + 1))
+    return json.dumps([prowlarr_release(i, ids[i % len(ids)]) for i in range(size)]).encode("utf-8")
+
+
+def torznab_item(i: int, indexer_id: str = "idx0") -> str:
+    """
+    生成一条与 Jackett torznab 接口返回格式一致的 item
+    """
+    return (
+        f'<item><title>Example.Movie.{2000 + i % 25}.2160p.WEB-DL.DDP5.1.Atmos.H.265-GROUP{i}</title>'
+        f'<guid>https://tracker.example/details.php?id={100000 + i}</guid>'
+        f'<jackettindexer id="{indexer_id}">{indexer_id}</jackettindexer>'
+        f'<type>private</type>'
+        f'<comments>https://tracker.example/details.php?id={100000 + i}</comments>'
+        f'<pubDate>Mon, 01 Jan 2024 00:00:00 +0000</pubDate>'
+        f'<size>{1073741824 + i * 4096}</size>'
+        f'<files>{1 + i % 40}</files>'
+        f'<grabs>{i % 500}</grabs>'
+        f'<description>Example movie release {i}</description>'
+        f'<link>http://127.0.0.1:9117/dl/{indexer_id}/?jackett_apikey=k&amp;path=abcdef{i}</link>'
+        f'<category>2000</category><category>100045</category>'
+        f'<enclosure url="http://127.0.0.1:9117/dl/{indexer_id}/?jackett_apikey=k&amp;path=abcdef{i}" '
+        f'length="{1073741824 + i * 4096}" type="application/x-bittorrent" />'
+        f'<torznab:attr name="category" value="2000" />'
+        f'<torznab:attr name="genre" value="" />'
+        f'<torznab:attr name="imdbid" value="tt{1000000 + i}" />'
+        f'<torznab:attr name="seeders" value="{i % 300}" />'
+        f'<torznab:attr name="peers" value="{i % 300 + i % 50}" />'
+        f'<torznab:attr name="infohash" value="{i:040x}" />'
+        f'<torznab:attr name="minimumratio" value="1" />'
+        f'<torznab:attr name="minimumseedtime" value="172800" />'
+        f'<torznab:attr name="downloadvolumefactor" value="{0 if i % 3 == 0 else 1}" />'
+        f'<torznab:attr name="uploadvolumefactor" value="1" />'
+        f'</item>'
+    )
+
+
+def torznab_response(size: int, indexer_ids: Optional[List[str]] = None) -> bytes:
+    """
+    生成包含 size 条结果的 torznab 检索响应，结果轮流归属 indexer_ids 中的索引器
+    """
+    indexer_ids = indexer_ids or ["idx0"]
+    items = "".join(torznab_item(i, indexer_ids[i % len(indexer_ids)]) for i in range(size))
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom" xmlns:torznab="http://torznab.com/schemas/2015/feed">'
+        '<channel><title>Jackett</title><description>Jackett</description>'
+        f'{items}</channel></rss>'
+    ).encode("utf-8")
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """
+    最近秩法计算分位数
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    进程峰值常驻内存（MB），不支持的平台返回 None
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 以字节为单位，Linux 以 KB 为单位
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def timeit(func: Callable[[], Any], repeat: int) -> List[float]:
+    """
+    重复执行并返回每次耗时（秒），执行前先预热一次
+    """
+    func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def retained_mb(func: Callable[[], Any]) -> float:
+    """
+    执行 func 并返回其结果常驻的内存（MB）
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = func()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return (after - before) / 1024 / 1024
+
+
+def report(label: str, samples: List[float], items: int = 0, baseline: Optional[float] = None) -> float:
+    """
+    输出耗时统计，返回中位数
+    """
+    median = statistics.median(samples)
+    line = f"{label:<24} median {median * 1000:9.2f} ms  min {min(samples) * 1000:9.2f} ms"
+    if items:
+        line += f"  {items / median:12,.0f} items/s"
+    if baseline:
+        line += f"  x{baseline / median:.2f}"
+    print(line)
+    return median
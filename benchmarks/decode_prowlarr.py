@@ -0,0 +1,64 @@
+"""
+Prowlarr 检索结果解码微基准：对比原 json.loads + dict.get 逐项转换与 ReleaseDecoder 各后端的耗时，
+以及全部结果常驻为 TorrentInfo 与暂存为 TorrentRecord 的内存占用
+
+用法：
+    python -m benchmarks.decode_prowlarr --moviepilot /path/to/MoviePilot --size 20000
+    python -m benchmarks.decode_prowlarr --fixture recorded_search.json
+"""
+import argparse
+import json
+from pathlib import Path
+
+from benchmarks.common import add_common_args, load_plugin, prowlarr_response, report, retained_mb, timeit
+
+
+def legacy_decode(module, body: bytes) -> list:
+    """
+    优化前的解码路径
+    """
+    data = json.loads(body)
+    return [(str(entry.get("indexerId")), entry.get("infoHash") or entry.get("magnetUrl"), module.TorrentInfo(
+        title=entry.get("title"),
+        enclosure=entry.get("downloadUrl") or entry.get("magnetUrl"),
+        description=entry.get("sortTitle"),
+        size=entry.get("size"),
+        seeders=entry.get("seeders"),
+        pubdate=entry.get("publishDate"),
+        page_url=entry.get("infoUrl") or entry.get("guid"),
+    )) for entry in data]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_common_args(parser)
+    parser.add_argument("--size", type=int, default=20000, help="生成样本的结果条数")
+    parser.add_argument("--fixture", help="使用录制的 Prowlarr 检索响应文件代替生成样本")
+    args = parser.parse_args()
+
+    module = load_plugin("prowlarrextend", args.moviepilot)
+    body = Path(args.fixture).read_bytes() if args.fixture else prowlarr_response(args.size, indexers=8)
+    items = len(legacy_decode(module, body))
+    print(f"响应大小 {len(body) / 1024 / 1024:.2f} MB，共 {items} 条结果")
+
+    baseline = report("legacy json", timeit(lambda: legacy_decode(module, body), args.repeat), items)
+    for backend in ("json", "orjson", "msgspec"):
+        try:
+            decoder = module.ReleaseDecoder(backend)
+        except ValueError:
+            print(f"{backend:<24} 未安装，跳过")
+            continue
+        expected = [torrent for _, _, torrent in legacy_decode(module, body)]
+        assert [record.to_torrent() for record in decoder.decode(body)] == expected, \
+            f"{backend} 解码结果与原实现不一致"
+        report(f"ReleaseDecoder[{backend}]", timeit(lambda: decoder.decode(body), args.repeat), items, baseline)
+        report("  + to_torrent", timeit(lambda: [record.to_torrent() for record in decoder.decode(body)],
+                                         args.repeat), items, baseline)
+
+    decoder = module.ReleaseDecoder()
+    print(f"常驻内存：TorrentInfo {retained_mb(lambda: legacy_decode(module, body)):.1f} MB，"
+          f"TorrentRecord {retained_mb(lambda: decoder.decode(body)):.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
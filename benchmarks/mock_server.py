@@ -0,0 +1,299 @@
+"""
+本地模拟 Jackett / Prowlarr 服务，用于离线基准测试
+
+回放 torznab XML 与 Prowlarr JSON 检索响应，可配置结果条数、响应延迟与错误注入。
+fixture_dir 下存在 torznab.xml / prowlarr.json 时原样回放录制的响应，否则按 size 生成。
+与 Jackett 一致，管理接口需携带登录 cookie：设置了管理密码时由 POST /UI/Dashboard 校验密码后下发，
+未设置时由 /UI/Login 直接下发。
+Jackett 索引器 idx{i} 带有标签 t{i % 2}，可用 tag:t0、tag:t1 过滤器测试聚合检索。
+
+单独运行时作为常驻服务，便于手工配置插件：
+    python -m benchmarks.mock_server --port 9117 --indexers 8 --size 100 --latency 0.05
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.common import prowlarr_response, torznab_response
+
+TORZNAB_CAPS = (
+    '<caps><server title="Jackett" />'
+    '<limits default="100" max="100" />'
+    '<searching>'
+    '<search available="yes" supportedParams="q" />'
+    '<tv-search available="yes" supportedParams="q,season,ep,imdbid" />'
+    '<movie-search available="yes" supportedParams="q,imdbid" />'
+    '</searching>'
+    '<categories>'
+    '<category id="2000" name="Movies"><subcat id="2045" name="Movies/UHD" /></category>'
+    '<category id="5000" name="TV"><subcat id="5045" name="TV/UHD" /></category>'
+    '</categories></caps>'
+)
+
+PROWLARR_CAPABILITIES = {
+    "categories": [{"id": 2000, "name": "Movies"}, {"id": 5000, "name": "TV"}],
+    "searchParams": ["q"],
+    "tvSearchParams": ["q", "season", "ep", "imdbId"],
+    "movieSearchParams": ["q", "imdbId"],
+}
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    # 默认监听队列只有 5，突发的并发连接会触发 SYN 重传，造成约 1 秒的虚假延迟
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class MockIndexerServer:
+    """
+    模拟 Jackett / Prowlarr 接口的 HTTP 服务
+    """
+
+    def __init__(self, indexers: int = 8, size: int = 100, latency: float = 0.05, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 500, fixture_dir: Optional[str] = None,
+                 host: str = "127.0.0.1", port: int = 0, seed: int = 0, admin_password: Optional[str] = None):
+        """
+        :param indexers: 模拟的索引器数量
+        :param size: 每个索引器每次检索返回的结果条数
+        :param latency: 每个请求的基础延迟（秒）
+        :param jitter: 在基础延迟上叠加的随机延迟上限（秒）
+        :param error_rate: 检索请求返回错误的概率
+        :param error_status: 注入错误时返回的状态码
+        :param fixture_dir: 录制响应所在目录
+        :param admin_password: Jackett 管理密码，None 为未设置
+        """
+        self.indexers = indexers
+        self.size = size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.admin_password = admin_password
+        self.requests = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._responses: Dict[tuple, bytes] = {}
+        self._fixtures: Dict[str, bytes] = {}
+        if fixture_dir:
+            for name in ("torznab.xml", "prowlarr.json"):
+                path = Path(fixture_dir) / name
+                if path.exists():
+                    self._fixtures[name] = path.read_bytes()
+        self._server = _HTTPServer((host, port), self.__handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockIndexerServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-indexer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockIndexerServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def jackett_ids(self, indexer_filter: str = "all") -> List[str]:
+        """
+        过滤器覆盖的 Jackett 索引器：all 为全部，tag:t0 / tag:t1 按标签，其余视为单个或逗号分隔的索引器
+        """
+        if indexer_filter == "all":
+            return [f"idx{i}" for i in range(self.indexers)]
+        if indexer_filter.startswith("tag:"):
+            return [f"idx{i}" for i in range(self.indexers) if f"t{i % 2}" == indexer_filter[4:]]
+        return indexer_filter.split(",")
+
+    def prowlarr_ids(self) -> List[int]:
+        return list(range(1, self.indexers + 1))
+
+    def torznab(self, indexer_ids: List[str]) -> bytes:
+        if "torznab.xml" in self._fixtures:
+            return self._fixtures["torznab.xml"]
+        return self.__cached(("torznab", tuple(indexer_ids)),
+                             lambda: torznab_response(self.size * len(indexer_ids), indexer_ids))
+
+    def prowlarr(self, indexer_ids: List[int]) -> bytes:
+        if "prowlarr.json" in self._fixtures:
+            return self._fixtures["prowlarr.json"]
+        return self.__cached(("prowlarr", tuple(indexer_ids)),
+                             lambda: prowlarr_response(self.size * len(indexer_ids), ids=indexer_ids))
+
+    def __cached(self, key: tuple, factory) -> bytes:
+        with self._lock:
+            if key not in self._responses:
+                self._responses[key] = factory()
+            return self._responses[key]
+
+    def count(self, name: str):
+        with self._lock:
+            self.requests[name] += 1
+
+    def delay(self) -> float:
+        with self._lock:
+            return self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+
+    def fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def __handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def send_body(self, body: bytes, content_type: str, status: int = 200, headers: dict = None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def send_json(self, data):
+                self.send_body(json.dumps(data).encode("utf-8"), "application/json")
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                form = parse_qs(self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode("utf-8"))
+                password = (form.get("password") or parse_qs(url.query).get("password") or [""])[0]
+                server.count("login")
+                time.sleep(server.latency)
+                if server.admin_password is not None and password != server.admin_password:
+                    return self.send_body(b"", "text/html", status=302, headers={"Location": "/UI/Login"})
+                self.send_login()
+
+            def send_login(self):
+                self.send_body(b"", "text/html", status=302,
+                               headers={"Set-Cookie": "Jackett=session; Path=/", "Location": "/UI/Dashboard"})
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                path = url.path
+                try:
+                    self.route(path, query)
+                except (BrokenPipeError, ConnectionResetError):
+                    # 客户端超时或取消请求
+                    pass
+
+            def route(self, path: str, query: Dict[str, List[str]]):
+                if path.startswith("/UI/Login"):
+                    if server.admin_password is None:
+                        server.count("login")
+                        return self.send_login()
+                    return self.send_body(b"<html></html>", "text/html")
+                if path.startswith("/UI/Dashboard"):
+                    server.count("dashboard")
+                    return self.send_body(b"<html></html>", "text/html")
+                # Jackett
+                if path == "/api/v2.0/indexers":
+                    if "Jackett=" not in (self.headers.get("Cookie") or ""):
+                        # 未登录时跳转到登录页
+                        return self.send_body(b"", "text/html", status=302, headers={"Location": "/UI/Login"})
+                    server.count("jackett_indexers")
+                    time.sleep(server.delay())
+                    return self.send_json([{"id": indexer_id, "name": indexer_id.upper(), "configured": True}
+                                           for indexer_id in server.jackett_ids()])
+                match = re.match(r"^/api/v2\.0/indexers/([^/]+)/results/torznab/?(api)?$", path)
+                if match:
+                    return self.torznab(match.group(1), query.get("t", ["search"])[0])
+                # Prowlarr
+                if path == "/api/v1/indexerstats":
+                    server.count("prowlarr_indexerstats")
+                    time.sleep(server.delay())
+                    return self.send_json({"indexers": [{"indexerId": i, "indexerName": f"P{i}"}
+                                                        for i in server.prowlarr_ids()]})
+                if path == "/api/v1/indexer":
+                    server.count("prowlarr_indexer")
+                    time.sleep(server.delay())
+                    return self.send_json([{"id": i, "name": f"P{i}", "enable": True, "protocol": "torrent",
+                                            "capabilities": PROWLARR_CAPABILITIES}
+                                           for i in server.prowlarr_ids()])
+                match = re.match(r"^/api/v1/indexer/(\d+)$", path)
+                if match:
+                    server.count("prowlarr_indexer")
+                    time.sleep(server.delay())
+                    return self.send_json({"id": int(match.group(1)), "name": f"P{match.group(1)}",
+                                           "capabilities": PROWLARR_CAPABILITIES})
+                if path == "/api/v1/search":
+                    return self.search(lambda: server.prowlarr(
+                        [int(i) for i in query.get("indexerIds", ["1"]) if i.isdigit()] or [1]),
+                        "application/json", "prowlarr_search")
+                self.send_body(b"", "text/plain", status=404)
+
+            def torznab(self, indexer: str, mode: str):
+                if mode == "caps":
+                    server.count("jackett_caps")
+                    time.sleep(server.delay())
+                    return self.send_body(TORZNAB_CAPS.encode("utf-8"), "application/xml")
+                if mode == "indexers":
+                    server.count("jackett_caps")
+                    time.sleep(server.delay())
+                    body = "".join(f'<indexer id="{indexer_id}" configured="true"><title>{indexer_id.upper()}</title>'
+                                   f'{TORZNAB_CAPS}</indexer>' for indexer_id in server.jackett_ids(indexer))
+                    return self.send_body(f"<indexers>{body}</indexers>".encode("utf-8"), "application/xml")
+                indexer_ids = server.jackett_ids(indexer)
+                self.search(lambda: server.torznab(indexer_ids), "application/rss+xml", "jackett_search")
+
+            def search(self, body, content_type: str, counter: str):
+                server.count(counter)
+                time.sleep(server.delay())
+                if server.fail():
+                    server.count("errors")
+                    return self.send_body(b"", "text/plain", status=server.error_status)
+                self.send_body(body(), content_type)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9117)
+    parser.add_argument("--indexers", type=int, default=8)
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--fixture-dir")
+    parser.add_argument("--admin-password", help="Jackett 管理密码，不指定时为未设置密码")
+    args = parser.parse_args()
+    server = MockIndexerServer(indexers=args.indexers, size=args.size, latency=args.latency, jitter=args.jitter,
+                               error_rate=args.error_rate, error_status=args.error_status,
+                               fixture_dir=args.fixture_dir, host=args.host, port=args.port,
+                               admin_password=args.admin_password)
+    print(f"模拟服务已启动：{server.url}，API Key 任意，"
+          f"Jackett 管理密码：{args.admin_password if args.admin_password is not None else '未设置'}")
+    try:
+        server.start()._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
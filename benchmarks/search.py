@@ -0,0 +1,175 @@
+"""
+检索基准：在本地模拟服务上驱动 JackettExtend / ProwlarrExtend 的 get_indexers 与 search_torrents，
+输出 p50/p95/p99 延迟、吞吐、上游请求数、内存分配与峰值 RSS
+
+用法：
+    python -m benchmarks.search --moviepilot /path/to/MoviePilot
+    python -m benchmarks.search --plugin prowlarr --indexers 40 --size 200 --latency 0.2 --jitter 0.3 \\
+        --error-rate 0.05 --concurrency 8 --config '{"batch_search": true}' --output bench_output.txt
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from benchmarks.common import add_common_args, load_plugin, peak_rss_mb, percentile
+from benchmarks.mock_server import MockIndexerServer
+
+PLUGINS = {
+    "jackett": ("jackettextend", "JackettExtend"),
+    "prowlarr": ("prowlarrextend", "ProwlarrExtend"),
+}
+
+
+def make_plugin(module, class_name: str, server: MockIndexerServer, config: Dict[str, Any]):
+    """
+    创建连接到模拟服务的插件实例，并等待索引器加载完成
+    """
+    plugin = getattr(module, class_name)()
+    conf = {
+        "enabled": True,
+        "host": server.url,
+        "api_key": "bench",
+        "password": "bench",
+        "cron": "0 0 */24 * *",
+        # 默认关闭结果缓存，测量的是真实检索路径
+        "cache_ttl": 0,
+    }
+    conf.update(config)
+    plugin.init_plugin(conf)
+    deadline = time.monotonic() + 30
+    while not plugin._indexers and time.monotonic() < deadline:
+        time.sleep(0.05)
+    if not plugin._indexers:
+        plugin.stop_service()
+        raise SystemExit(f"{class_name} 未能从模拟服务加载索引器")
+    return plugin
+
+
+def run_workload(name: str, tasks: List[Callable[[], int]], concurrency: int, server: MockIndexerServer,
+                 trace_alloc: bool) -> Dict[str, Any]:
+    """
+    执行一组任务，每个任务返回结果条数
+    """
+    latencies = []
+    results = []
+
+    def timed(task: Callable[[], int]):
+        started = time.perf_counter()
+        count = task()
+        latencies.append(time.perf_counter() - started)
+        results.append(count)
+
+    server.requests.clear()
+    if trace_alloc:
+        tracemalloc.start()
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(timed, tasks))
+    else:
+        for task in tasks:
+            timed(task)
+    elapsed = time.perf_counter() - started
+    alloc_peak = None
+    if trace_alloc:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        alloc_peak = peak / 1024 / 1024
+
+    return {
+        "workload": name,
+        "ops": len(tasks),
+        "concurrency": concurrency,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "ops_per_s": len(tasks) / elapsed if elapsed else 0,
+        "results": sum(results),
+        "empty": sum(1 for count in results if not count),
+        "upstream": dict(server.requests),
+        "alloc_peak_mb": alloc_peak,
+        "rss_peak_mb": peak_rss_mb(),
+    }
+
+
+def bench_plugin(key: str, args, server: MockIndexerServer) -> List[Dict[str, Any]]:
+    module_name, class_name = PLUGINS[key]
+    module = load_plugin(module_name, args.moviepilot)
+    plugin = make_plugin(module, class_name, server, json.loads(args.config) if args.config else {})
+    sites = [{"name": indexer["name"], "domain": indexer["domain"]} for indexer in plugin._indexers]
+    rounds = []
+    try:
+        rounds.append(run_workload(
+            "get_indexers", [lambda: len(plugin.get_indexers())] * args.repeat, 1, server, args.trace_alloc))
+
+        def search_tasks(prefix: str) -> List[Callable[[], int]]:
+            # 关键字各不相同，避免命中缓存或合并
+            return [
+                (lambda site=sites[i % len(sites)], keywords=[f"{prefix}{i}-{k}" for k in range(args.keywords)]:
+                 len(plugin.search_torrents(site, keywords)))
+                for i in range(args.searches)
+            ]
+
+        rounds.append(run_workload("search", search_tasks("seq"), 1, server, args.trace_alloc))
+        rounds.append(run_workload("search_burst", search_tasks("burst"), args.concurrency, server, args.trace_alloc))
+        # 多个调用方同时检索相同站点与关键字
+        same = [lambda i=i: len(plugin.search_torrents(sites[i % len(sites)], ["same"]))
+                for i in range(args.searches)]
+        rounds.append(run_workload("search_overlap", same, args.concurrency, server, args.trace_alloc))
+    finally:
+        plugin.stop_service()
+    for item in rounds:
+        item["plugin"] = class_name
+    return rounds
+
+
+def print_table(rows: List[Dict[str, Any]]):
+    header = f"{'plugin':<15}{'workload':<16}{'ops':>5}{'conc':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}" \
+             f"{'ops/s':>9}{'results':>9}{'empty':>6}{'upstream':>9}{'alloc MB':>9}{'rss MB':>8}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        alloc = f"{row['alloc_peak_mb']:.1f}" if row["alloc_peak_mb"] is not None else "-"
+        rss = f"{row['rss_peak_mb']:.0f}" if row["rss_peak_mb"] is not None else "-"
+        upstream = sum(count for name, count in row["upstream"].items() if name != "errors")
+        print(f"{row['plugin']:<15}{row['workload']:<16}{row['ops']:>5}{row['concurrency']:>5}"
+              f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['ops_per_s']:>9.1f}"
+              f"{row['results']:>9}{row['empty']:>6}{upstream:>9}{alloc:>9}{rss:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_common_args(parser)
+    parser.add_argument("--plugin", choices=[*PLUGINS, "all"], default="all", help="测试的插件")
+    parser.add_argument("--indexers", type=int, default=8, help="模拟的索引器数量")
+    parser.add_argument("--size", type=int, default=100, help="每个索引器每次检索返回的结果条数")
+    parser.add_argument("--latency", type=float, default=0.05, help="每个请求的基础延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="叠加的随机延迟上限（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="检索请求返回错误的概率")
+    parser.add_argument("--error-status", type=int, default=500, help="注入错误时返回的状态码")
+    parser.add_argument("--fixture-dir", help="录制响应目录，包含 torznab.xml / prowlarr.json")
+    parser.add_argument("--searches", type=int, default=40, help="每个检索场景的调用次数")
+    parser.add_argument("--keywords", type=int, default=2, help="每次检索的关键字数量")
+    parser.add_argument("--concurrency", type=int, default=8, help="并发场景的调用方数量")
+    parser.add_argument("--config", help="覆盖插件配置的 JSON，如 '{\"batch_search\": true}'")
+    parser.add_argument("--trace-alloc", action="store_true", help="使用 tracemalloc 统计内存分配峰值（会降低吞吐）")
+    parser.add_argument("--output", help="将结果以 JSON 写入文件，便于前后对比")
+    args = parser.parse_args()
+
+    rows = []
+    with MockIndexerServer(indexers=args.indexers, size=args.size, latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, error_status=args.error_status,
+                           fixture_dir=args.fixture_dir) as server:
+        for key in (PLUGINS if args.plugin == "all" else [args.plugin]):
+            rows.extend(bench_plugin(key, args, server))
+    print_table(rows)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": rows}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,292 @@
 # _*_ coding: utf-8 _*_
-import copy
+import asyncio
+import threading
+import time
 import traceback
-from typing import List, Dict, Any, Tuple, Optional
-from datetime import datetime, timedelta
-import xml.dom.minidom
+from typing import List, Dict, Any, Tuple, Optional, Callable
+from email.utils import parsedate_to_datetime
 from urllib.parse import urlencode, quote_plus
+from xml.etree.ElementTree import Element, XMLPullParser, fromstring
 
 import pytz
 import requests
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-from app.helper.sites import SitesHelper
-
 from app.core.context import TorrentInfo
 from app.log import logger
-from app.plugins import _PluginBase
 from app.core.config import settings
 from app.schemas import MediaType
-from app.utils.dom import DomUtils
 from app.utils.http import RequestUtils
-from app.utils.string import StringUtils
+
+from .core import IndexerCaps, RateLimiter, RequestTrace, SearchQuery, _IndexerPluginBase
+
+
+class TorrentRecord:
+    """
+    检索结果的紧凑暂存记录：解析时只保存映射字段的原始值，不创建 TorrentInfo，
+    经过去重、按索引器拆分、缓存后，只对最终返回给调用方的结果转换为 TorrentInfo；记录创建后只读
+    """
+    __slots__ = ("indexer", "infohash", "title", "enclosure", "description", "page_url", "pubdate", "size",
+                 "seeders", "peers", "grabs", "imdbid", "category", "downloadvolumefactor", "uploadvolumefactor")
+    # 转换为 TorrentInfo 的字段
+    fields = __slots__[2:]
+
+    def __init__(self, indexer: str = "", infohash: Optional[str] = None, **fields):
+        """
+        :param indexer: 所属 indexer id
+        :param infohash: infohash 或磁力链接
+        :param fields: TorrentInfo 字段，pubdate 为 RFC 822 格式原文
+        """
+        self.indexer = indexer
+        self.infohash = infohash
+        for key in self.fields:
+            setattr(self, key, fields.get(key))
+
+    def to_torrent(self, **extra) -> TorrentInfo:
+        """
+        转换为 TorrentInfo，发布时间在此时才转换为本地时间
+        :param extra: 附加的 TorrentInfo 字段，如 site_name
+        """
+        fields = {key: getattr(self, key) for key in self.fields}
+        fields["pubdate"] = self.format_pubdate(self.pubdate)
+        fields.update(extra)
+        return TorrentInfo(**{key: value for key, value in fields.items() if value is not None})
+
+    @classmethod
+    def from_torznab(cls, item: Element) -> Optional["TorrentRecord"]:
+        """
+        将单个 torznab item 节点转换为记录，缺少标题或下载链接时返回 None
+        """
+        # 标题
+        title = item.findtext("title")
+        if not title:
+            return None
+        fields = {
+            "title": title,
+            "description": item.findtext("description", default=""),
+            "page_url": item.findtext("comments", default=""),
+            "pubdate": item.findtext("pubDate"),
+        }
+        # 种子大小、完成数，Jackett 以子节点返回，缺少时取自 torznab:attr
+        for key in ("size", "grabs"):
+            value = item.findtext(key)
+            if value:
+                try:
+                    fields[key] = int(float(value))
+                except ValueError:
+                    pass
+        extras = TorznabAttrMapper.map(item, fields)
+        # 种子链接，缺少时使用磁力链接
+        enclosure_node = item.find("enclosure")
+        fields["enclosure"] = (enclosure_node.get("url") if enclosure_node is not None else "") \
+            or extras.get("magneturl")
+        if not fields["enclosure"]:
+            return None
+        return cls(infohash=extras.get("infohash") or extras.get("magneturl"), **fields)
+
+    @staticmethod
+    def format_pubdate(pubdate: Optional[str]) -> Optional[str]:
+        """
+        将 RFC 822 格式的发布时间转换为本地时间字符串
+        """
+        if not pubdate:
+            return None
+        try:
+            return parsedate_to_datetime(pubdate).astimezone(pytz.timezone(settings.TZ)).strftime("%Y-%m-%d %H:%M:%S")
+        except (TypeError, ValueError, AttributeError):
+            return None
+
+
+class TorznabAttrMapper:
+    """
+    torznab:attr 扩展属性映射：按属性名查表，每个属性只做一次类型转换，
+    属于 TorrentInfo 的写入构造参数，infohash、magneturl 作为附加信息返回，表外的属性（tmdbid、year 等）不做转换直接跳过
+    """
+    tag = "{http://torznab.com/schemas/2015/feed}attr"
+    # 属性名 -> (字段名, 类型转换, 是否为 TorrentInfo 字段)
+    table: Dict[str, Tuple[str, Callable[[str], Any], bool]] = {
+        "seeders": ("seeders", lambda value: int(float(value)), True),
+        "peers": ("peers", lambda value: int(float(value)), True),
+        "grabs": ("grabs", lambda value: int(float(value)), True),
+        "size": ("size", lambda value: int(float(value)), True),
+        "downloadvolumefactor": ("downloadvolumefactor", float, True),
+        "uploadvolumefactor": ("uploadvolumefactor", float, True),
+        "imdb": ("imdbid", lambda value: value if value.startswith("tt") else f"tt{int(value):07d}", True),
+        "imdbid": ("imdbid", lambda value: value if value.startswith("tt") else f"tt{int(value):07d}", True),
+        "category": ("category", lambda value: MediaType.MOVIE.value if 2000 <= int(value) < 3000
+                     else MediaType.TV.value if 5000 <= int(value) < 6000 else None, True),
+        "infohash": ("infohash", str.strip, False),
+        "magneturl": ("magneturl", str.strip, False),
+    }
+
+    @classmethod
+    def map(cls, item: Element, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        解析 item 下的全部 torznab:attr，同名属性以第一个有效值为准
+        :param fields: TorrentInfo 构造参数，识别到的字段直接写入，已有值不覆盖
+        :return: 不属于 TorrentInfo 的附加属性
+        """
+        extras = {}
+        for attr in item.findall(cls.tag):
+            rule = cls.table.get(attr.get("name"))
+            if not rule:
+                continue
+            key, convert, is_field = rule
+            target = fields if is_field else extras
+            value = attr.get("value")
+            if not value or target.get(key) is not None:
+                continue
+            try:
+                value = convert(value)
+            except (TypeError, ValueError):
+                continue
+            if value is not None:
+                target[key] = value
+        return extras
+
+
+class TorznabStreamParser:
+    """
+    Torznab XML 增量解析器：逐块喂入数据，每解析完一个 item 即转换为 TorrentRecord 并释放该节点
+    """
+
+    def __init__(self, convert: Callable[[Element], Optional[TorrentRecord]]):
+        self._convert = convert
+        self._parser = XMLPullParser(events=("start", "end"))
+        # 当前打开的节点路径，用于在 item 处理完后将其从父节点移除
+        self._parents: List[Element] = []
+
+    def feed(self, chunk: bytes) -> List[TorrentRecord]:
+        """
+        喂入一个数据块
+        :return: 本次解析完成的记录列表，所属 indexer id 取自 jackettindexer 节点
+        """
+        if chunk:
+            self._parser.feed(chunk)
+        return self.__drain()
+
+    def close(self) -> List[TorrentRecord]:
+        """
+        结束解析，数据不完整时抛出 ParseError
+        """
+        self._parser.close()
+        return self.__drain()
+
+    def __drain(self) -> List[TorrentRecord]:
+        items = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._parents.append(elem)
+                continue
+            self._parents.pop()
+            if elem.tag != "item":
+                continue
+            try:
+                record = self._convert(elem)
+                if record:
+                    indexer_node = elem.find("jackettindexer")
+                    record.indexer = indexer_node.get("id", "") if indexer_node is not None else ""
+                    items.append(record)
+            except Exception as e:
+                logger.error(str(e))
+            finally:
+                elem.clear()
+                if self._parents:
+                    self._parents[-1].remove(elem)
+        return items
+
+
+class JackettSession:
+    """
+    Jackett 管理接口登录会话：首次请求时登录，cookie 在插件运行期间保留复用；
+    会话失效（跳转登录页或 401/403）时重新登录并重试一次，未设置管理密码时不登录
+    """
+
+    def __init__(self, host: str, password: Optional[str], session: requests.Session, headers: dict,
+                 proxies: Optional[dict] = None, timeout: int = 30, limiter: Optional[RateLimiter] = None):
+        """
+        :param session: 独立的会话，cookie 保存在其中
+        :param limiter: 与检索共用的限流器
+        """
+        self.host = host.rstrip("/")
+        self.password = password
+        self.headers = headers
+        self.proxies = proxies
+        self.timeout = timeout
+        self.limiter = limiter
+        # 登录次数
+        self.logins = 0
+        self._session = session
+        self._authenticated = False
+        # 每次登录递增，用于识别其它线程已完成的重新登录
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Optional[requests.Response]:
+        """
+        携带登录 cookie 请求管理接口
+        :param path: 以 / 开头的接口路径
+        :return: 响应，登录失败或请求失败返回 None
+        """
+        generation = self._generation
+        if not self._authenticated and not self.__login(generation):
+            return None
+        res = self.__get(path)
+        if not self.__expired(res):
+            return res
+        logger.info("Jackett 登录已失效，重新登录")
+        if not self.__login(generation):
+            return None
+        res = self.__get(path)
+        return None if self.__expired(res) else res
+
+    def close(self):
+        self._session.close()
+
+    def __get(self, path: str) -> Optional[requests.Response]:
+        if self.limiter:
+            self.limiter.wait(self.host)
+        return RequestUtils(headers=self.headers, session=self._session, timeout=self.timeout).get_res(
+            f"{self.host}{path}", allow_redirects=False, proxies=self.proxies)
+
+    def __login(self, generation: int) -> bool:
+        """
+        登录并保存 cookie，其它线程已在 generation 之后重新登录时直接复用
+        """
+        with self._lock:
+            if self._generation != generation:
+                return self._authenticated
+            self._generation += 1
+            self._authenticated = False
+            self._session.cookies.clear()
+            if self.limiter:
+                self.limiter.wait(self.host)
+            request = RequestUtils(headers=self.headers, session=self._session, timeout=self.timeout)
+            if not self.password:
+                # 未设置管理密码时 Jackett 由登录页直接下发 cookie 并跳转到控制台
+                res = request.get_res(f"{self.host}/UI/Login", allow_redirects=True, proxies=self.proxies)
+            else:
+                res = request.post_res(
+                    url=f"{self.host}/UI/Dashboard",
+                    data={"password": self.password},
+                    params={"password": self.password},
+                    allow_redirects=False,
+                    proxies=self.proxies
+                )
+            self.logins += 1
+            if res is None or res.status_code >= 400 or not self._session.cookies:
+                logger.warning("Jackett 登录失败，无法获取 cookie")
+                return False
+            self._authenticated = True
+            return True
+
+    @staticmethod
+    def __expired(res: Optional[requests.Response]) -> bool:
+        """
+        未登录时 Jackett 管理接口跳转到登录页
+        """
+        return res is not None and (res.is_redirect or res.status_code in (401, 403))
 
 
-class JackettExtend(_PluginBase):
+class JackettExtend(_IndexerPluginBase):
     # 插件名称
     plugin_name = "JackettExtend"
     # 插件描述
@@ -30,7 +294,7 @@ class JackettExtend(_PluginBase):
     # 插件图标
     plugin_icon = "Jackett_A.png"
     # 插件版本
-    plugin_version = "1.2"
+    plugin_version = "2.0"
     # 插件作者
     plugin_author = "jtcymc"
     # 作者主页
@@ -42,205 +306,67 @@ class JackettExtend(_PluginBase):
     # 可使用的用户级别
     auth_level = 1
 
+    # 上游服务名称
+    _backend = "Jackett"
+
     # 私有属性
-    _scheduler = None
-    _cron = None
-    _enabled = False
-    _proxy = False
-    _host = ""
-    _api_key = ""
     _password = ""
-    _onlyonce = False
-    _indexers = []
-    sites_helper = None
+    _aggregate_filter = "all"
+    # tag 过滤器覆盖的 indexer，随索引器列表刷新获取，None 为尚未获取
+    _aggregate_members = None
+    # Jackett 管理接口登录会话
+    _jackett_session = None
     # 仅用于标识，避免重复注册
     jackett_domain = "jackett_extend.jtcymc"
 
-    def init_plugin(self, config: dict = None):
-        """
-        初始化插件
-        """
-        self.sites_helper = SitesHelper()
-        # 读取配置
-        if config:
-            self._host = config.get("host")
-            if self._host:
-                if not self._host.startswith('http'):
-                    self._host = "http://" + self._host
-                if self._host.endswith('/'):
-                    self._host = self._host.rstrip('/')
-            self._api_key = config.get("api_key")
-            self._password = config.get("password")
-            self._enabled = config.get("enabled")
-            self._proxy = config.get("proxy")
-            self._onlyonce = config.get("onlyonce")
-            self._cron = config.get("cron") or "0 0 */24 * *"
-        if not self._enabled:
-            return
-        # 停止现有任务
-        self.stop_service()
-
-        # 启动定时任务 & 立即运行一次
-        self._scheduler = BackgroundScheduler(timezone=settings.TZ)
-        if self._cron:
-            logger.info(f"【{self.plugin_name}】 索引更新服务启动，周期：{self._cron}")
-            self._scheduler.add_job(self.get_status, CronTrigger.from_crontab(self._cron))
-
-        if self._onlyonce:
-            logger.info(f"【{self.plugin_name}】开始获取索引器状态")
-            self._scheduler.add_job(self.get_status, 'date',
-                                    run_date=datetime.now(tz=pytz.timezone(settings.TZ)) + timedelta(seconds=3))
-            # 关闭一次性开关
-            self._onlyonce = False
-            self.__update_config()
-
-        if self._cron or self._onlyonce:
-            # 启动服务
-            self._scheduler.print_jobs()
-            self._scheduler.start()
-        if not self._indexers:
-            self.get_status()
-        for indexer in self._indexers:
-            domain = indexer.get("domain", "")
-            site_info = self.sites_helper.get_indexer(domain)
-            if not site_info:
-                new_indexer = copy.deepcopy(indexer)
-                # sites_helper 添加
-                self.sites_helper.add_indexer(domain, new_indexer)
-
-    def get_status(self):
+    def _read_config(self, config: dict):
         """
-        检查连通性
-        :return: True、False
+        读取配置
         """
-        if not self._api_key or not self._host:
-            return False
-        self._indexers = self.get_indexers()
-        return True if isinstance(self._indexers, list) and len(self._indexers) > 0 else False
-
-    def get_state(self) -> bool:
-        return self._enabled
+        super()._read_config(config)
+        self._password = config.get("password")
+        self._batch_search = config.get("aggregate_search")
+        self._aggregate_filter = (config.get("aggregate_filter") or "all").strip("/ ") or "all"
 
-    def stop_service(self):
-        """
-        退出插件
-        """
-        try:
-            if self._scheduler:
-                self._scheduler.remove_all_jobs()
-                if self._scheduler.running:
-                    self._scheduler.shutdown()
-                self._scheduler = None
-        except Exception as e:
-            logger.error(f"【{self.plugin_name}】停止插件错误: {str(e)}")
+    def _config_values(self) -> Dict[str, Any]:
+        return {
+            **super()._config_values(),
+            "password": self._password,
+            "aggregate_search": self._batch_search,
+            "aggregate_filter": self._aggregate_filter,
+        }
 
-    def __update_config(self):
+    def _init_components(self):
         """
-        更新插件配置
+        创建检索组件及管理接口会话
         """
-        self.update_config({
-            "onlyonce": False,
-            "cron": self._cron,
-            "host": self._host,
-            "api_key": self._api_key,
-            "password": self._password,
-        })
+        super()._init_components()
+        self._aggregate_members = None
+        # 管理接口使用独立会话保存登录 cookie
+        self._jackett_session = JackettSession(self._host or "", self._password,
+                                               session=self._create_session(),
+                                               headers=self.__admin_headers(),
+                                               proxies=settings.PROXY if self._proxy else None,
+                                               limiter=self._limiter)
 
-    def search_torrents(self, site, keywords, mtype: Optional[MediaType] = None, page: Optional[int] = 0) -> List[
-        TorrentInfo]:
+    def stop_service(self):
         """
-        使用 Jackett Torznab API 根据关键字检索种子
+        退出插件
         """
-        results = []
-
-        if not site or (site.get("name", "").split("-")[0] != self.plugin_name):
-            return results
-
-        domain = StringUtils.get_url_domain(site.get("domain", ""))
-        if not domain:
-            logger.warning(f"【{self.plugin_name}】站点域名无法解析")
-            return results
-
-        indexer_name = domain.split(".")[-1]
-        categories = self.get_cat(mtype)
-
-        for keyword in keywords:
-            if not keyword:
-                continue
-
-            try:
-                logger.info(f"【{self.plugin_name}】开始检索 Indexer：\"{site.get('name')}\"，关键词：\"{keyword}\"")
-
-                params = {
-                    "apikey": self._api_key,
-                    "t": "search",
-                    "q": keyword,
-                    "cat": ",".join(map(str, categories))
-                }
-                query_string = urlencode(params, quote_via=quote_plus)
-                api_url = f"{self._host.rstrip('/')}/api/v2.0/indexers/{indexer_name}/results/torznab/?{query_string}"
-
-                result_array = self.__parse_torznab_xml(api_url)
-
-                if not result_array:
-                    logger.warning(f"【{self.plugin_name}】Indexer：\"{site.get('name')}\" 未检索到数据")
-                    continue
-
-                logger.info(f"【{self.plugin_name}】Indexer：\"{site.get('name')}\" 返回数据：{len(result_array)} 条")
-                results.extend(result_array)
-
-            except Exception as e:
-                logger.error(f"【{self.plugin_name}】检索出错：{str(e)}")
-
-        return results
-
-    @staticmethod
-    def get_cat(mtype: Optional[MediaType] = None):
-        if not mtype:
-            return [2000, 5000]
-        elif mtype == MediaType.MOVIE:
-            return [2000]
-        elif mtype == MediaType.TV:
-            return [5000]
-        else:
-            return [2000, 5000]
+        super().stop_service()
+        if self._jackett_session:
+            self._jackett_session.close()
+            self._jackett_session = None
 
     def get_indexers(self):
         """
         获取配置的 Jackett Indexer 信息
         :return: Indexer 列表，每项包含 id、name、url、domain、public、proxy、parser
         """
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-            "User-Agent": settings.USER_AGENT,
-            "X-Api-Key": self._api_key,
-            "Accept": "application/json, text/javascript, */*; q=0.01"
-        }
-
-        cookie = None
-        session = requests.session()
-
+        if not self._jackett_session:
+            return []
         try:
-            login_url = f"{self._host.rstrip('/')}/UI/Dashboard"
-            login_data = {"password": self._password}
-            login_params = {"password": self._password}
-            login_res = RequestUtils(headers=headers, session=session).post_res(
-                url=login_url,
-                data=login_data,
-                params=login_params,
-                proxies=settings.PROXY if self._proxy else None
-            )
-            if login_res and session.cookies:
-                cookie = session.cookies.get_dict()
-            else:
-                logger.warning(f"【{self.plugin_name}】Jackett 登录失败，无法获取 cookie")
-
-            indexer_query_url = f"{self._host.rstrip('/')}/api/v2.0/indexers?configured=true"
-            ret = RequestUtils(headers=headers, cookies=cookie).get_res(
-                indexer_query_url,
-                proxies=settings.PROXY if self._proxy else None
-            )
-
+            ret = self._jackett_session.get("/api/v2.0/indexers?configured=true")
             if not ret or not ret.json():
                 logger.warning(f"【{self.plugin_name}】未获取到任何 indexer 配置")
                 return []
@@ -268,187 +394,209 @@ class JackettExtend(_PluginBase):
             logger.error(f"【{self.plugin_name}】获取 Jackett indexers 失败：{str(e)}")
             return []
 
-    def get_module(self) -> Dict[str, Any]:
+    async def _request(self, targets: List[str], query: SearchQuery, categories: List[int], page: int,
+                       metric_key: str) -> Optional[List[TorrentRecord]]:
         """
-        获取插件模块声明，用于胁持系统模块实现（方法名：方法实现）
-        {
-            "id1": self.xxx1,
-            "id2": self.xxx2,
-        }
+        请求 Torznab 检索接口，Jackett 不分页，每次请求一个 indexer 或聚合过滤器
         """
-        return {
-            "search_torrents": self.search_torrents,
+        target = targets[0]
+        # 聚合端点会检索其覆盖的全部 indexer，按各 indexer 限速，覆盖范围未知时按全部 indexer 限速
+        rate_keys = (self._batch_members(target) or self._indexer_keys()) if target == self._aggregate_filter \
+            else [target]
+        return await self.__parse_torznab_xml(self.__torznab_url(target, query, categories),
+                                              metric_key=metric_key, rate_keys=rate_keys)
+
+    def _batch_targets(self, indexer_id: str) -> List[str]:
+        """
+        聚合检索只请求一次 Jackett 聚合端点（all 或 tag 过滤）
+        """
+        return [self._aggregate_filter]
+
+    def _batch_members(self, target: str) -> List[str]:
+        """
+        聚合端点覆盖的 indexer，按 jackettindexer 拆分结果，过滤器外的 indexer 退回单独检索。
+        tag 过滤器的覆盖范围尚未获取时为空，有结果的 indexer 仍按结果拆分，其余退回单独检索
+        """
+        if target == "all":
+            return self._indexer_keys()
+        return list(self._aggregate_members or [])
+
+    def get_status(self):
+        """
+        刷新索引器列表，开启聚合检索且使用 tag 过滤器时同时获取过滤器覆盖的 indexer
+        """
+        if not super().get_status():
+            return False
+        if self._batch_search and self._aggregate_filter != "all" and self._engine and self._engine.running:
+            try:
+                members = self._engine.run(self.__fetch_aggregate_members(), timeout=self._run_timeout())
+            except Exception as e:
+                logger.error(f"【{self.plugin_name}】获取聚合过滤器 \"{self._aggregate_filter}\" 的 Indexer 出错：{str(e)}")
+                members = None
+            if members is not None:
+                self._aggregate_members = members
+                logger.info(f"【{self.plugin_name}】聚合过滤器 \"{self._aggregate_filter}\" 包含 {len(members)} 个 Indexer")
+        return True
+
+    async def __fetch_aggregate_members(self) -> Optional[List[str]]:
+        """
+        通过过滤器端点的 t=indexers 获取其覆盖的已配置 indexer
+        """
+        query_string = urlencode({"apikey": self._api_key, "t": "indexers", "configured": "true"},
+                                 quote_via=quote_plus)
+        body = await self._engine.fetch(
+            f"{self._host.rstrip('/')}/api/v2.0/indexers/{self._aggregate_filter}/results/torznab/api?{query_string}",
+            headers=self._search_headers())
+        if not body:
+            return None
+        return [node.get("id") for node in fromstring(body).iter("indexer") if node.get("id")]
+
+    def __torznab_url(self, indexer: str, query: SearchQuery, categories: List[int],
+                      limit: Optional[int] = None) -> str:
+        """
+        拼装 Torznab 检索地址
+        :param indexer: indexer id，或 all、tag:xxx 等聚合过滤器
+        :param limit: 返回结果条数上限，None 为不限制
+        """
+        params = {
+            "apikey": self._api_key,
+            "t": query.mode,
         }
+        if query.keyword is not None:
+            params["q"] = query.keyword
+        if query.imdbid:
+            params["imdbid"] = query.imdbid
+        if query.season is not None:
+            params["season"] = query.season
+        if query.episode is not None:
+            params["ep"] = query.episode
+        params["cat"] = ",".join(map(str, categories))
+        if limit:
+            params["limit"] = limit
+        query_string = urlencode(params, quote_via=quote_plus)
+        return f"{self._host.rstrip('/')}/api/v2.0/indexers/{indexer}/results/torznab/?{query_string}"
+
+    def _caps_keys(self) -> List[str]:
+        """
+        需要获取能力的索引器，开启聚合检索时包含聚合过滤器
+        """
+        keys = super()._caps_keys()
+        if self._batch_search:
+            keys.append(self._aggregate_filter)
+        return keys
 
-    def get_api(self) -> List[Dict[str, Any]]:
+    async def _fetch_all_caps(self, indexers: List[str]) -> Dict[str, IndexerCaps]:
         """
-        获取插件API
-        [{
-            "path": "/xx",
-            "endpoint": self.xxx,
-            "methods": ["GET", "POST"],
-            "summary": "API说明"
-        }]
+        先通过 t=indexers 一次获取全部已配置索引器的能力，缺少的再逐个请求 t=caps
         """
+        caps = {}
+        try:
+            query_string = urlencode({"apikey": self._api_key, "t": "indexers", "configured": "true"},
+                                     quote_via=quote_plus)
+            body = await self._engine.fetch(
+                f"{self._host.rstrip('/')}/api/v2.0/indexers/all/results/torznab/api?{query_string}",
+                headers=self._search_headers())
+            if body:
+                for node in fromstring(body).iter("indexer"):
+                    caps_node = node.find("caps")
+                    if node.get("id") and caps_node is not None:
+                        caps[node.get("id")] = IndexerCaps.from_torznab(caps_node)
+        except Exception as e:
+            logger.debug(f"【{self.plugin_name}】批量获取 Indexer 能力失败：{str(e)}")
+        missing = [indexer for indexer in indexers if indexer not in caps]
+        for indexer, result in zip(missing, await asyncio.gather(*[self.__fetch_caps(indexer)
+                                                                   for indexer in missing])):
+            if result:
+                caps[indexer] = result
+        return {indexer: caps[indexer] for indexer in indexers if indexer in caps}
+
+    async def __fetch_caps(self, indexer: str) -> Optional[IndexerCaps]:
+        """
+        请求 torznab t=caps
+        """
+        try:
+            query_string = urlencode({"apikey": self._api_key, "t": "caps"}, quote_via=quote_plus)
+            body = await self._engine.fetch(
+                f"{self._host.rstrip('/')}/api/v2.0/indexers/{indexer}/results/torznab/api?{query_string}",
+                headers=self._search_headers())
+            if body:
+                return IndexerCaps.from_torznab(fromstring(body))
+        except Exception as e:
+            logger.warning(f"【{self.plugin_name}】获取 Indexer：{indexer} 能力失败：{str(e)}")
+        return None
 
-        pass
+    def __admin_headers(self) -> dict:
+        """
+        Jackett 管理接口请求头
+        """
+        return {
+            "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+            "User-Agent": settings.USER_AGENT,
+            "X-Api-Key": self._api_key,
+            "Accept": "application/json, text/javascript, */*; q=0.01"
+        }
 
-    def __parse_torznab_xml(self, url) -> List[TorrentInfo]:
+    def _ping_url(self, indexer: str) -> str:
+        return self.__torznab_url(indexer, SearchQuery(keyword=""), [], limit=1)
+
+    def _to_torrent(self, record: TorrentRecord) -> TorrentInfo:
+        return record.to_torrent(site_name=self.jackett_domain)
+
+    async def __parse_torznab_xml(self, url, metric_key: str,
+                                  rate_keys: List[str]) -> Optional[List[TorrentRecord]]:
         """
-        从 torznab XML 中解析种子信息
+        从 torznab XML 中解析种子信息，边下载边解析，避免一次性读入并构建整棵 DOM 树
         :param url: XML 数据的 URL
-        :return: TorrentInfo 列表
+        :param metric_key: 记录检索指标使用的索引器标识
+        :param rate_keys: 请求涉及的 indexer，按其限速
+        :return: 记录列表，请求或解析失败时返回 None
         """
         if not url:
             return []
+        parser = TorznabStreamParser(TorrentRecord.from_torznab)
+        trace = RequestTrace()
+        items = []
+        cancelled = False
+
+        def feed(chunk: bytes):
+            started = time.perf_counter()
+            try:
+                items.extend(parser.feed(chunk))
+            finally:
+                trace.parse_time += time.perf_counter() - started
+
         try:
-            ret = RequestUtils(timeout=60).get_res(url,
-                                                   proxies=settings.PROXY if self._proxy else None)
-        except Exception as e:
-            logger.error(str(e))
-            return []
-        if not ret or not ret.text:
-            return []
-        xmls = ret.text
-        torrents = []
-        try:
-            # 解析XML
-            dom_tree = xml.dom.minidom.parseString(xmls)
-            root_node = dom_tree.documentElement
-            items = root_node.getElementsByTagName("item")
-            for item in items:
-                try:
-                    # 标题
-                    title = DomUtils.tag_value(item, "title", default="")
-                    if not title:
-                        continue
-                    # 种子链接
-                    enclosure = DomUtils.tag_value(item, "enclosure", "url", default="")
-                    if not enclosure:
-                        continue
-                    # 描述
-                    description = DomUtils.tag_value(item, "description", default="")
-                    # 种子大小
-                    size = DomUtils.tag_value(item, "size", default=0)
-                    # 种子页面
-                    page_url = DomUtils.tag_value(item, "comments", default="")
-                    # 发布时间
-                    pubdate = DomUtils.tag_value(item, "pubDate", default="")
-                    if pubdate:
-                        pubdate = StringUtils.unify_datetime_str(pubdate)
-                    # 做种数
-                    seeders = 0
-                    # 下载数
-                    peers = 0
-                    # imdbid
-                    imdbid = ""
-
-                    torznab_attrs = item.getElementsByTagName("torznab:attr")
-                    for torznab_attr in torznab_attrs:
-                        name = torznab_attr.getAttribute('name')
-                        value = torznab_attr.getAttribute('value')
-                        if name == "seeders":
-                            seeders = value
-                        if name == "peers":
-                            peers = value
-                        if name == "downloadvolumefactor":
-                            downloadvolumefactor = value
-                            if float(downloadvolumefactor) == 0:
-                                freeleech = True
-                        if name == "uploadvolumefactor":
-                            uploadvolumefactor = value
-                        if name == "imdbid":
-                            imdbid = value
-
-                    tmp_dict = TorrentInfo(
-                        title=title,
-                        enclosure=enclosure,
-                        description=description,
-                        size=size,
-                        seeders=seeders,
-                        peers=peers,
-                        site_name=self.jackett_domain,
-                        page_url=page_url,
-                        imdbid=imdbid
-                    )
-                    torrents.append(tmp_dict)
-                except Exception as e:
-                    logger.error(str(e))
-                    continue
+            body = await self._engine.fetch(url,
+                                            headers=self._search_headers(),
+                                            timeout=self._request_timeout(metric_key),
+                                            on_chunk=feed,
+                                            trace=trace,
+                                            rate_keys=rate_keys)
+            if body is None:
+                return None
+            items.extend(parser.close())
+        except asyncio.CancelledError:
+            # 超出检索时限或对冲请求落后被取消，不计入指标
+            cancelled = True
+            raise
         except Exception as e:
+            trace.error = "parse"
             logger.error(f"检索错误：{traceback.format_exc()}")
-            pass
+            return items or None
+        finally:
+            if not cancelled:
+                self._metrics.record(metric_key, trace, len(items))
 
-        return torrents
+        return items
 
-    def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
+    def _form(self) -> Tuple[List[dict], Dict[str, Any]]:
         """
-        拼装插件配置页面，需要返回两块数据：1、页面配置；2、数据结构
+        插件开关、Jackett 连接信息与聚合检索配置
         """
         return [
             {
-                'component': 'VForm',
+                'component': 'VRow',
                 'content': [
-                    {
-                        'component': 'VRow',
-                        'content': [
-                            {
-                                'component': 'VRow',
-                                'content': [
-                                    {
-                                        'component': 'VCol',
-                                        'props': {
-                                            'cols': 12,
-                                            'md': 4
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VSwitch',
-                                                'props': {
-                                                    'model': 'enabled',
-                                                    'label': '启用插件',
-                                                }
-                                            }
-                                        ]
-                                    },
-                                    {
-                                        'component': 'VCol',
-                                        'props': {
-                                            'cols': 12,
-                                            'md': 4
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VSwitch',
-                                                'props': {
-                                                    'model': 'proxy',
-                                                    'label': '使用代理服务器',
-                                                }
-                                            }
-                                        ]
-                                    },
-                                    {
-                                        'component': 'VCol',
-                                        'props': {
-                                            'cols': 12,
-                                            'md': 6
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VSwitch',
-                                                'props': {
-                                                    'model': 'onlyonce',
-                                                    'label': '立即运行一次',
-                                                    'hint': '打开后立即运行一次获取索引器列表，否则需要等到预先设置的更新周期才会获取'
-                                                }
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-
-                        ]
-                    },
                     {
                         'component': 'VRow',
                         'content': [
@@ -456,16 +604,14 @@ class JackettExtend(_PluginBase):
                                 'component': 'VCol',
                                 'props': {
                                     'cols': 12,
-                                    'md': 6
+                                    'md': 4
                                 },
                                 'content': [
                                     {
-                                        'component': 'VTextField',
+                                        'component': 'VSwitch',
                                         'props': {
-                                            'model': 'host',
-                                            'label': 'Jackett地址',
-                                            'placeholder': 'http://127.0.0.1:9117',
-                                            'hint': 'Jackett访问地址和端口，如为https需加https://前缀。注意需要先在Jackett中添加indexer，才能正常测试通过和使用'
+                                            'model': 'enabled',
+                                            'label': '启用插件',
                                         }
                                     }
                                 ]
@@ -474,40 +620,14 @@ class JackettExtend(_PluginBase):
                                 'component': 'VCol',
                                 'props': {
                                     'cols': 12,
-                                    'md': 6
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VTextField',
-                                        'props': {
-                                            'model': 'api_key',
-                                            'label': 'Api Key',
-                                            'placeholder': '',
-                                            'hint': 'Jackett管理界面右上角复制API Key'
-                                        }
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        'component': 'VRow',
-                        'content': [
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 6
+                                    'md': 4
                                 },
                                 'content': [
                                     {
-                                        'component': 'VTextField',
+                                        'component': 'VSwitch',
                                         'props': {
-                                            'model': 'password',
-                                            'label': '密码',
-                                            'placeholder': '',
-                                            'hint': 'Jackett管理界面中配置的Admin password，如未配置可为空',
-                                            'type': 'password'
+                                            'model': 'proxy',
+                                            'label': '使用代理服务器',
                                         }
                                     }
                                 ]
@@ -520,168 +640,164 @@ class JackettExtend(_PluginBase):
                                 },
                                 'content': [
                                     {
-                                        'component': 'VTextField',
+                                        'component': 'VSwitch',
                                         'props': {
-                                            'model': 'cron',
-                                            'label': '更新周期',
-                                            'placeholder': '0 0 */24 * *',
-                                            'hint': '索引列表更新周期，支持5位cron表达式，默认每24小时运行一次'
+                                            'model': 'onlyonce',
+                                            'label': '立即运行一次',
+                                            'hint': '打开后立即运行一次获取索引器列表，否则需要等到预先设置的更新周期才会获取'
                                         }
                                     }
                                 ]
                             }
                         ]
                     },
+
+                ]
+            },
+            {
+                'component': 'VRow',
+                'content': [
                     {
-                        'component': 'VRow',
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 6
+                        },
                         'content': [
                             {
-                                'component': 'VCol',
+                                'component': 'VTextField',
                                 'props': {
-                                    'cols': 12,
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VAlert',
-                                        'props': {
-                                            'type': 'success',
-                                            'variant': 'tonal',
-                                            'text': '将“查看数据”列表中 “站点domain” => 站点管理 新增站点 站点名+ https://或http:// 直接新增'}
-                                    }
-                                ]
+                                    'model': 'host',
+                                    'label': 'Jackett地址',
+                                    'placeholder': 'http://127.0.0.1:9117',
+                                    'hint': 'Jackett访问地址和端口，如为https需加https://前缀。注意需要先在Jackett中添加indexer，才能正常测试通过和使用'
+                                }
                             }
                         ]
                     },
                     {
-                        'component': 'VRow',
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 6
+                        },
                         'content': [
                             {
-                                'component': 'VCol',
+                                'component': 'VTextField',
                                 'props': {
-                                    'cols': 12,
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VAlert',
-                                        'props': {
-                                            'type': 'info',
-                                            'variant': 'tonal',
-                                            'text': '该种方式扩建检索，无法进行站点连通性监测，官方默认方式添加的正常不影响！'
-                                                    '日志出现报如下错误时，可以不用管，由于插件没有检索到数据会触发后续模块检索，导致错误'
-                                                    'indexer - 【JackettExtend】ACG.RIP 搜索出错：NoneType object has no attribute get'
-                                        }
-                                    }
-                                ]
+                                    'model': 'api_key',
+                                    'label': 'Api Key',
+                                    'placeholder': '',
+                                    'hint': 'Jackett管理界面右上角复制API Key'
+                                }
                             }
                         ]
                     }
                 ]
-            }
-        ], {
-            "enabled": False,
-            "proxy": False,
-            "host": "",
-            "api_key": "",
-            "password": "",
-            "cron": "0 0 */24 * *",
-            "onlyonce": False
-        }
-
-    def _ensure_sites_loaded(self) -> bool:
-        """
-        确保 self._indexers 已加载数据，若为空则尝试重新加载。
-        :return: 成功加载返回 True，否则 False
-        """
-        if isinstance(self._indexers, list) and len(self._indexers) > 0:
-            return True
-
-        # 尝试重新加载站点数据
-        self.get_status()
-
-        return isinstance(self._indexers, list) and len(self._indexers) > 0
-
-    def get_page(self) -> List[dict]:
-        """
-            拼装插件详情页面，需要返回页面配置，同时附带数据
-        """
-        if not self._ensure_sites_loaded():
-            return []
-
-        items = []
-        for site in self._indexers:
-            items.append({
-                'component': 'tr',
+            },
+            {
+                'component': 'VRow',
                 'content': [
                     {
-                        'component': 'td',
-                        'text': site.get("id")
-                    },
-                    {
-                        'component': 'td',
-                        'text': f"https://{site.get('domain')}"
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 6
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'password',
+                                    'label': '密码',
+                                    'placeholder': '',
+                                    'hint': 'Jackett管理界面中配置的Admin password，如未配置可为空',
+                                    'type': 'password'
+                                }
+                            }
+                        ]
                     },
                     {
-                        'component': 'td',
-                        'text': site.get("public")
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 6
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'cron',
+                                    'label': '更新周期',
+                                    'placeholder': '0 0 */24 * *',
+                                    'hint': '索引列表更新周期，支持5位cron表达式，默认每24小时运行一次'
+                                }
+                            }
+                        ]
                     }
                 ]
-            })
-
-        return [
+            },
             {
                 'component': 'VRow',
                 'content': [
                     {
                         'component': 'VCol',
                         'props': {
-                            'cols': 12
+                            'cols': 12,
+                            'md': 4
                         },
                         'content': [
                             {
-                                'component': 'VTable',
+                                'component': 'VTextField',
                                 'props': {
-                                    'hover': True
-                                },
-                                'content': [
-                                    {
-                                        'component': 'thead',
-                                        'content': [
-                                            {
-                                                'component': 'tr',
-                                                'content': [
-                                                    {
-                                                        'component': 'th',
-                                                        'props': {
-                                                            'class': 'text-start ps-4'
-                                                        },
-                                                        'text': 'id'
-                                                    },
-                                                    {
-                                                        'component': 'th',
-                                                        'props': {
-                                                            'class': 'text-start ps-4'
-                                                        },
-                                                        'text': '站点domain'
-                                                    },
-                                                    {
-                                                        'component': 'th',
-                                                        'props': {
-                                                            'class': 'text-start ps-4'
-                                                        },
-                                                        'text': '是否公开'
-                                                    }
-                                                ]
-                                            }
-                                        ]
-                                    },
-                                    {
-                                        'component': 'tbody',
-                                        'content': items
-                                    }
-                                ]
+                                    'model': 'search_workers',
+                                    'label': '检索并发数',
+                                    'placeholder': '16',
+                                    'type': 'number',
+                                    'hint': '对同一主机同时进行的最大检索请求数'
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VSwitch',
+                                'props': {
+                                    'model': 'aggregate_search',
+                                    'label': '聚合检索',
+                                    'hint': '同一关键词只请求一次Jackett聚合端点，按索引器拆分结果后供各站点复用'
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'aggregate_filter',
+                                    'label': '聚合过滤器',
+                                    'placeholder': 'all',
+                                    'hint': '聚合检索使用的Jackett过滤器，如 all、tag:电影，过滤器外的索引器单独检索'
+                                }
                             }
                         ]
                     }
                 ]
             }
-        ]
+        ], {
+            "password": "",
+            "aggregate_search": False,
+            "aggregate_filter": "all"
+        }
@@ -1,25 +1,138 @@
 # _*_ coding: utf-8 _*_
-import copy
-import traceback
-from typing import List, Dict, Any, Tuple, Optional
-from datetime import datetime, timedelta
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Tuple, Optional, Generator
 from urllib.parse import urlencode, quote_plus
 
-import pytz
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-from app.helper.sites import SitesHelper
-
 from app.core.context import TorrentInfo
-from app.plugins import _PluginBase
+from app.log import logger
 from app.core.config import settings
 from app.schemas import MediaType
 from app.utils.http import RequestUtils
-from app.log import logger
 from app.utils.string import StringUtils
 
+from .core import IndexerCaps, RequestTrace, SearchCache, SearchQuery, _IndexerPluginBase
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class TorrentRecord:
+    """
+    检索结果的紧凑暂存记录：解码时只保存映射字段的原始值，不创建 TorrentInfo，
+    经过去重、按索引器拆分、缓存后，只对最终返回给调用方的结果转换为 TorrentInfo；记录创建后只读
+    """
+    __slots__ = ("indexer", "infohash", "title", "enclosure", "description", "size", "seeders", "pubdate",
+                 "page_url")
+
+    def __init__(self, indexer: str = "", infohash: Optional[str] = None, title: Optional[str] = None,
+                 enclosure: Optional[str] = None, description: Optional[str] = None, size: Any = None,
+                 seeders: Any = None, pubdate: Optional[str] = None, page_url: Optional[str] = None):
+        """
+        :param indexer: 所属 indexerId
+        :param infohash: infohash 或磁力链接
+        """
+        self.indexer = indexer
+        self.infohash = infohash
+        self.title = title
+        self.enclosure = enclosure
+        self.description = description
+        self.size = size
+        self.seeders = seeders
+        self.pubdate = pubdate
+        self.page_url = page_url
+
+    def to_torrent(self, **extra) -> TorrentInfo:
+        """
+        转换为 TorrentInfo
+        :param extra: 附加的 TorrentInfo 字段
+        """
+        return TorrentInfo(
+            title=self.title,
+            enclosure=self.enclosure,
+            description=self.description,
+            size=self.size,
+            seeders=self.seeders,
+            pubdate=self.pubdate,
+            page_url=self.page_url,
+            **extra
+        )
+
+
+if msgspec:
+    class _ReleaseEntry(msgspec.Struct):
+        """
+        Prowlarr 检索结果中转换 TorrentRecord 所需的字段，其余字段解码时直接跳过
+        """
+        indexerId: Any = None
+        infoHash: Any = None
+        magnetUrl: Any = None
+        downloadUrl: Any = None
+        title: Any = None
+        sortTitle: Any = None
+        size: Any = None
+        seeders: Any = None
+        publishDate: Any = None
+        infoUrl: Any = None
+        guid: Any = None
+
+
+class ReleaseDecoder:
+    """
+    Prowlarr 检索结果解码器
+    安装了 msgspec 时只解码映射字段，其次使用 orjson，均未安装时回退到标准库 json
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        """
+        :param backend: 指定解码后端 msgspec/orjson/json，默认选择已安装的最快后端
+        """
+        available = [name for name, module in (("msgspec", msgspec), ("orjson", orjson)) if module] + ["json"]
+        if backend and backend not in available:
+            raise ValueError(f"解码后端 {backend} 不可用")
+        self.backend = backend or available[0]
+        self._decoder = msgspec.json.Decoder(List[_ReleaseEntry]) if self.backend == "msgspec" else None
+        self._loads = orjson.loads if self.backend == "orjson" else json.loads
+
+    def decode(self, body: bytes) -> Optional[List[TorrentRecord]]:
+        """
+        解码检索结果并转换为 TorrentRecord 列表
+        :param body: 响应内容
+        :return: 数据格式不是结果列表时返回 None，内容不是合法 JSON 时抛出 ValueError
+        """
+        if self._decoder:
+            try:
+                entries = self._decoder.decode(body)
+            except msgspec.ValidationError:
+                return None
+            return [TorrentRecord(str(entry.indexerId), entry.infoHash or entry.magnetUrl, entry.title,
+                                  entry.downloadUrl or entry.magnetUrl, entry.sortTitle, entry.size, entry.seeders,
+                                  entry.publishDate, entry.infoUrl or entry.guid)
+                    for entry in entries]
+
+        data = self._loads(body)
+        if not isinstance(data, list):
+            return None
+        results = []
+        append = results.append
+        for entry in data:
+            get = entry.get
+            append(TorrentRecord(str(get("indexerId")), get("infoHash") or get("magnetUrl"), get("title"),
+                                 get("downloadUrl") or get("magnetUrl"), get("sortTitle"), get("size"),
+                                 get("seeders"), get("publishDate"), get("infoUrl") or get("guid")))
+        return results
+
 
-class ProwlarrExtend(_PluginBase):
+class ProwlarrExtend(_IndexerPluginBase):
     # 插件名称
     plugin_name = "ProwlarrExtend"
     # 插件描述
@@ -27,7 +140,7 @@ class ProwlarrExtend(_PluginBase):
     # 插件图标
     plugin_icon = "Prowlarr.png"
     # 插件版本
-    plugin_version = "1.2"
+    plugin_version = "2.0"
     # 插件作者
     plugin_author = "jtcymc"
     # 作者主页
@@ -38,127 +151,57 @@ class ProwlarrExtend(_PluginBase):
     plugin_order = 16
     # 可使用的用户级别
     auth_level = 1
+    # 上游服务名称
+    _backend = "Prowlarr"
+
     # 私有属性
-    _scheduler = None
-    _cron = None
-    _enabled = False
-    _proxy = False
-    _host = ""
-    _api_key = ""
-    _onlyonce = False
-    _indexers = []
-    sites_helper = None
+    # 检索结果解码器，无状态，所有实例共用
+    _decoder = ReleaseDecoder()
+    _prefetch_pages = 0
+    # 预取缓冲区，缓存键 -> (创建时间, 请求任务)
+    _prefetched = OrderedDict()
+    # 每页条数
+    _page_size = 150
+    # 预取缓冲区最多保留的页数及有效期（秒）
+    _prefetch_max = 32
+    _prefetch_ttl = 300
+    # 各页上游返回的去重前条数，缓存键 -> 条数，分页时据此判断是否已到最后一页
+    _page_counts = OrderedDict()
+    _page_counts_max = 1000
     # 仅用于标识，避免重复注册
     prowlarr_domain = "prowlarr_extend.jtcymc"
 
-    def init_plugin(self, config: dict = None):
-        """
-        初始化插件
-        """
-        self.sites_helper = SitesHelper()
-        # 读取配置
-        if config:
-            self._host = config.get("host")
-            if self._host:
-                if not self._host.startswith('http'):
-                    self._host = "http://" + self._host
-                if self._host.endswith('/'):
-                    self._host = self._host.rstrip('/')
-            self._api_key = config.get("api_key")
-            self._enabled = config.get("enabled")
-            self._proxy = config.get("proxy")
-            self._onlyonce = config.get("onlyonce")
-            self._cron = config.get("cron") or "0 0 */24 * *"
-
-        # 停止现有任务
-        self.stop_service()
-        # 启动定时任务 & 立即运行一次
-        self._scheduler = BackgroundScheduler(timezone=settings.TZ)
-        if self._cron:
-            logger.info(f"【{self.plugin_name}】 索引更新服务启动，周期：{self._cron}")
-            self._scheduler.add_job(self.get_status, CronTrigger.from_crontab(self._cron))
-
-        if self._onlyonce:
-            logger.info(f"【{self.plugin_name}】开始获取索引器状态")
-            self._scheduler.add_job(self.get_status, 'date',
-                                    run_date=datetime.now(tz=pytz.timezone(settings.TZ)) + timedelta(seconds=3))
-            # 关闭一次性开关
-            self._onlyonce = False
-            self.__update_config()
-
-        if self._cron or self._onlyonce:
-            # 启动服务
-            self._scheduler.print_jobs()
-            self._scheduler.start()
-        if not self._indexers:
-            self.get_status()
-        for indexer in self._indexers:
-            domain = indexer.get("domain", "")
-            site_info = self.sites_helper.get_indexer(domain)
-            if not site_info:
-                new_indexer = copy.deepcopy(indexer)
-                # sites_helper 添加prowlarr_indexer
-                self.sites_helper.add_indexer(domain, new_indexer)
-
-    def get_status(self):
-        """
-        检查连通性
-        :return: True、False
-        """
-        if not self._api_key or not self._host:
-            return False
-        self._indexers = self.get_indexers()
-        return True if isinstance(self._indexers, list) and len(self._indexers) > 0 else False
-
-    def get_state(self) -> bool:
-        return self._enabled
-
-    def stop_service(self):
-        """
-        退出插件
-        """
-        try:
-            if self._scheduler:
-                self._scheduler.remove_all_jobs()
-                if self._scheduler.running:
-                    self._scheduler.shutdown()
-                self._scheduler = None
-        except Exception as e:
-            logger.error(f"【{self.plugin_name}】停止插件错误: {str(e)}")
-
-    def __update_config(self):
+    def _read_config(self, config: dict):
         """
-        更新插件配置
+        读取配置
         """
-        self.update_config({
-            "onlyonce": False,
-            "cron": self._cron,
-            "host": self._host,
-            "api_key": self._api_key
-        })
+        super()._read_config(config)
+        self._prefetch_pages = self._to_int(config.get("prefetch_pages"), 0)
+        self._batch_search = config.get("batch_search")
 
-    def get_api(self) -> List[Dict[str, Any]]:
+    def _config_values(self) -> Dict[str, Any]:
+        return {
+            **super()._config_values(),
+            "prefetch_pages": self._prefetch_pages,
+            "batch_search": self._batch_search
+        }
+
+    def _init_components(self):
         """
-        获取插件API
-        [{
-            "path": "/xx",
-            "endpoint": self.xxx,
-            "methods": ["GET", "POST"],
-            "summary": "API说明"
-        }]
+        创建检索组件及分页预取缓冲区
         """
-        pass
+        # 分页预取
+        self._prefetched = OrderedDict()
+        self._page_counts = OrderedDict()
+        super()._init_components()
 
-    def get_module(self) -> Dict[str, Any]:
+    def get_metrics(self) -> Dict[str, Any]:
         """
-        获取插件模块声明，用于胁持系统模块实现（方法名：方法实现）
-        {
-            "id1": self.xxx1,
-            "id2": self.xxx2,
-        }
+        索引器检索指标
         """
         return {
-            "search_torrents": self.search_torrents,
+            **super().get_metrics(),
+            "decoder": self._decoder.backend
         }
 
     def get_indexers(self):
@@ -167,15 +210,12 @@ class ProwlarrExtend(_PluginBase):
 
         :return: Indexer 列表，包含 id, name, url, domain, public, proxy 信息
         """
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-            "User-Agent": settings.USER_AGENT,
-            "X-Api-Key": self._api_key,
-            "Accept": "application/json, text/javascript, */*; q=0.01"
-        }
+        headers = self._search_headers()
         indexer_query_url = f"{self._host.rstrip('/')}/api/v1/indexerstats"
         try:
-            ret = RequestUtils(headers=headers).get_res(indexer_query_url)
+            if self._limiter:
+                self._limiter.wait(indexer_query_url)
+            ret = RequestUtils(headers=headers, session=self._session).get_res(indexer_query_url)
             if not ret:
                 logger.warning(f"【{self.plugin_name}】获取 indexer 请求无响应")
                 return []
@@ -211,361 +251,347 @@ class ProwlarrExtend(_PluginBase):
             logger.error(f"【{self.plugin_name}】获取 indexer 失败：{str(e)}")
             return []
 
-    def search_torrents(self, site, keywords, mtype: Optional[MediaType] = None, page: Optional[int] = 0) -> List[
-        TorrentInfo]:
+    def iter_torrents(self, site, keywords, mtype: Optional[MediaType] = None,
+                      max_pages: int = 10) -> Generator[TorrentInfo, None, None]:
         """
-        根据关键字检索种子
+        逐页检索并逐条返回 TorrentInfo，开启预取时后续页已在后台请求，翻页无需等待
+        :param max_pages: 最多检索的页数
         """
-        results = []
-
-        if not site or not keywords:
-            return results
-
-        if site.get("name", "").split("-")[0] != self.plugin_name:
-            return results
-
-        # 提取 Indexer ID
-        domain = StringUtils.get_url_domain(site.get("domain", ""))
+        domain = StringUtils.get_url_domain((site or {}).get("domain", ""))
         indexer_id = domain.split(".")[-1] if domain else ""
-        if not indexer_id:
-            logger.warning(f"【{self.plugin_name}】无法提取索引 ID，跳过站点：{site.get('name')}")
+        categories = self.get_cat(mtype)
+        keywords = [keyword for keyword in keywords or [] if keyword]
+        for page in range(max_pages):
+            torrents = self.search_torrents(site, keywords, mtype=mtype, page=page)
+            yield from torrents
+            # 按上游返回的去重前条数判断，各关键词都不足一页说明已到最后一页，不受去重与检索时限截断影响
+            counts = [self._page_counts.get(SearchCache.make_key(indexer_id, keyword, categories, page))
+                      for keyword in keywords]
+            if not any(count is not None and count >= self._page_size for count in counts):
+                # 超出检索时限未完成的关键词无法判断，本页有结果时继续翻页
+                if not torrents or None not in counts:
+                    return
+
+    async def _request(self, targets: List[str], query: SearchQuery, categories: List[int], page: int,
+                       metric_key: str) -> Optional[List[TorrentRecord]]:
+        """
+        调用 Prowlarr 检索接口，合并检索时一次携带多个 indexerIds
+        """
+        api_url = self.__search_url(targets, query, categories, page)
+
+        trace = RequestTrace()
+        results = []
+        cancelled = False
+        try:
+            body = await self._engine.fetch(api_url, headers=self._search_headers(),
+                                            timeout=self._request_timeout(metric_key),
+                                            trace=trace, rate_keys=targets)
+            if not body:
+                return None
+            started = time.perf_counter()
+            try:
+                decoded = self._decoder.decode(body)
+                if decoded is None:
+                    trace.error = "parse"
+                    return None
+                results = decoded
+            except ValueError:
+                trace.error = "parse"
+                raise
+            finally:
+                trace.parse_time = time.perf_counter() - started
             return results
+        except asyncio.CancelledError:
+            # 超出检索时限或对冲请求落后被取消，不计入指标
+            cancelled = True
+            raise
+        finally:
+            if not cancelled:
+                self._metrics.record(metric_key, trace, len(results))
+
+    def __search_url(self, indexer_ids: List[str], query: SearchQuery, categories: List[int],
+                     page: Optional[int] = 0, limit: Optional[int] = None) -> str:
+        """
+        拼装 Prowlarr 检索地址，movie、tvsearch 检索的 ID 与季集以 {ImdbId:tt0000000}、{Season:1} 的形式附加在关键词后
+        :param limit: 返回结果条数上限，默认为分页大小
+        """
+        terms = [query.keyword] if query.keyword else []
+        if query.imdbid:
+            terms.append(f"{{ImdbId:{query.imdbid}}}")
+        if query.season is not None:
+            terms.append(f"{{Season:{query.season}}}")
+        if query.episode is not None:
+            terms.append(f"{{Episode:{query.episode}}}")
+        params = [
+                     ("query", " ".join(terms)),
+                     ("type", query.mode),
+                     ("limit", limit or self._page_size),
+                     ("offset", page * self._page_size if page else 0),
+                 ] + [("indexerIds", indexer_id) for indexer_id in indexer_ids] \
+                   + [("categories", cat) for cat in categories]
+        query_string = urlencode(params, quote_via=quote_plus)
+        return f"{self._host.rstrip('/')}/api/v1/search?{query_string}"
+
+    def _prefetch(self, indexer_id: str, keyword: str, categories: List[int], query: SearchQuery,
+                  search_categories: List[int], page: int, count: int):
+        """
+        本页满页时在后台请求后续页放入预取缓冲区，已缓存或已在预取的页跳过，超出缓冲区上限时丢弃最早的预取
+        """
+        if not self._prefetch_pages or count < self._page_size:
+            return
+        for next_page in range(page + 1, page + 1 + self._prefetch_pages):
+            key = SearchCache.make_key(indexer_id, keyword, categories, next_page)
+            if key in self._prefetched or (self._cache and key in self._cache):
+                continue
+            task = asyncio.ensure_future(self._request([indexer_id], query, search_categories, next_page,
+                                                       metric_key=indexer_id))
+            # 被丢弃的预取不再等待，标记异常已处理
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._prefetched[key] = (time.monotonic(), task)
+        while len(self._prefetched) > self._prefetch_max:
+            _, (_, task) = self._prefetched.popitem(last=False)
+            task.cancel()
+
+    def _on_page(self, indexer_ids: List[str], keyword: str, categories: List[int], page: int, count: int):
+        """
+        记录各页去重前的条数，超出上限时丢弃最早的记录
+        """
+        for indexer_id in indexer_ids:
+            key = SearchCache.make_key(indexer_id, keyword, categories, page)
+            self._page_counts[key] = count
+            self._page_counts.move_to_end(key)
+        while len(self._page_counts) > self._page_counts_max:
+            self._page_counts.popitem(last=False)
+
+    async def _take_prefetched(self, key: tuple) -> Optional[List[TorrentRecord]]:
+        """
+        取出预取的页，未预取、已过期或预取失败返回 None
+        """
+        entry = self._prefetched.pop(key, None)
+        if not entry:
+            return None
+        created, task = entry
+        if time.monotonic() - created > self._prefetch_ttl:
+            task.cancel()
+            return None
+        try:
+            return await task
+        except Exception as e:
+            logger.debug(f"【{self.plugin_name}】预取失败：{str(e)}")
+            return None
 
-        # 构建请求头
-        headers = {
+    def _search_headers(self) -> dict:
+        """
+        检索请求头
+        """
+        return {
             "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
             "User-Agent": settings.USER_AGENT,
             "X-Api-Key": self._api_key,
             "Accept": "application/json, text/javascript, */*; q=0.01"
         }
-        categories = self.get_cat(mtype)
-        for keyword in keywords:
-            if not keyword:
-                continue
-            try:
-                logger.info(f"【{self.plugin_name}】开始检索 Indexer：{site.get('name')}，关键词：{keyword}")
-                params = [
-                             ("query", keyword),
-                             ("indexerIds", indexer_id),
-                             ("type", "search"),
-                             ("limit", 150),
-                             ("offset", page * 150 if page else 0),
-                         ] + [("categories", cat) for cat in categories]
-                query_string = urlencode(params, quote_via=quote_plus)
-                api_url = f"{self._host.rstrip('/')}/api/v1/search?{query_string}"
-
-                response = RequestUtils(headers=headers).get_res(api_url)
-                if not response:
-                    logger.warning(f"【{self.plugin_name}】{site.get('name')} 返回为空")
-                    continue
 
-                data = response.json()
-                if not isinstance(data, list):
-                    logger.warning(f"【{self.plugin_name}】{site.get('name')} 返回数据格式异常")
-                    continue
-
-                for entry in data:
-                    torrent = TorrentInfo(
-                        title=entry.get("title"),
-                        enclosure=entry.get("downloadUrl") or entry.get("magnetUrl"),
-                        description=entry.get("sortTitle"),
-                        size=entry.get("size"),
-                        seeders=entry.get("seeders"),
-                        pubdate=entry.get("publishDate"),
-                        page_url=entry.get("infoUrl") or entry.get("guid"),
-                    )
-                    results.append(torrent)
-
-            except Exception as e:
-                logger.error(f"【{self.plugin_name}】检索错误：{str(e)}\n{traceback.format_exc()}")
-
-        return results
-
-    @staticmethod
-    def get_cat(mtype: Optional[MediaType] = None):
-        if not mtype:
-            return [2000, 5000]
-        elif mtype == MediaType.MOVIE:
-            return [2000]
-        elif mtype == MediaType.TV:
-            return [5000]
-        else:
-            return [2000, 5000]
-
-    def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
+    async def _fetch_all_caps(self, indexers: List[str]) -> Dict[str, IndexerCaps]:
+        """
+        一次请求获取全部索引器定义中的 capabilities
         """
-        拼装插件配置页面，需要返回两块数据：1、页面配置；2、数据结构
+        body = await self._engine.fetch(f"{self._host.rstrip('/')}/api/v1/indexer", headers=self._search_headers())
+        if not body:
+            return {}
+        data = json.loads(body)
+        if not isinstance(data, list):
+            return {}
+        return {str(definition.get("id")): IndexerCaps.from_prowlarr(definition["capabilities"])
+                for definition in data
+                if isinstance(definition, dict) and isinstance(definition.get("capabilities"), dict)}
+
+    def _ping_url(self, indexer_id: str) -> str:
+        return self.__search_url([indexer_id], SearchQuery(keyword=""), [], limit=1)
+
+    def _form(self) -> Tuple[List[dict], Dict[str, Any]]:
+        """
+        插件开关、Prowlarr 连接信息、合并检索与分页预取配置
         """
         return [
             {
-                'component': 'VForm',
+                'component': 'VRow',
                 'content': [
                     {
-                        'component': 'VRow',
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
                         'content': [
                             {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 4
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VSwitch',
-                                        'props': {
-                                            'model': 'enabled',
-                                            'label': '启用插件',
-                                        }
-                                    }
-                                ]
-                            },
-                            {
-                                'component': 'VCol',
+                                'component': 'VSwitch',
                                 'props': {
-                                    'cols': 12,
-                                    'md': 4
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VSwitch',
-                                        'props': {
-                                            'model': 'proxy',
-                                            'label': '使用代理服务器',
-                                        }
-                                    }
-                                ]
+                                    'model': 'enabled',
+                                    'label': '启用插件',
+                                }
                             }
                         ]
                     },
                     {
-                        'component': 'VRow',
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
                         'content': [
                             {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 6
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VSwitch',
-                                        'props': {
-                                            'model': 'onlyonce',
-                                            'label': '立即运行一次',
-                                            'hint': '打开后立即运行一次获取索引器列表，否则需要等到预先设置的更新周期才会获取'
-                                        }
-                                    }
-                                ]
-                            },
-                            {
-                                'component': 'VCol',
+                                'component': 'VSwitch',
                                 'props': {
-                                    'cols': 12,
-                                    'md': 6
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VTextField',
-                                        'props': {
-                                            'model': 'cron',
-                                            'label': '更新周期',
-                                            'placeholder': '0 0 */24 * *',
-                                            'hint': '索引列表更新周期，支持5位cron表达式，默认每24小时运行一次'
-                                        }
-                                    }
-                                ]
+                                    'model': 'proxy',
+                                    'label': '使用代理服务器',
+                                }
                             }
                         ]
                     },
                     {
-                        'component': 'VRow',
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
                         'content': [
                             {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 6
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VTextField',
-                                        'props': {
-                                            'model': 'host',
-                                            'label': 'Prowlarr地址',
-                                            'placeholder': 'http://127.0.0.1:9696',
-                                            'hint': 'Prowlarr访问地址和端口，如为https需加https://前缀。注意需要先在Prowlarr中添加搜刮器，同时勾选所有搜刮器后搜索一次，才能正常测试通过和使用'
-                                        }
-                                    }
-                                ]
-                            },
-                            {
-                                'component': 'VCol',
+                                'component': 'VSwitch',
                                 'props': {
-                                    'cols': 12,
-                                    'md': 6
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VTextField',
-                                        'props': {
-                                            'model': 'api_key',
-                                            'label': 'Api Key',
-                                            'placeholder': '',
-                                            'hint': '在Prowlarr->Settings->General->Security-> API Key中获取'
-                                        }
-                                    }
-                                ]
+                                    'model': 'batch_search',
+                                    'label': '合并检索',
+                                    'hint': '同一关键词只请求一次并检索全部索引器，结果按索引器拆分后供各站点复用'
+                                }
                             }
                         ]
-                    },
+                    }
+                ]
+            },
+            {
+                'component': 'VRow',
+                'content': [
                     {
-                        'component': 'VRow',
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 6
+                        },
                         'content': [
                             {
-                                'component': 'VCol',
+                                'component': 'VSwitch',
                                 'props': {
-                                    'cols': 12,
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VAlert',
-                                        'props': {
-                                            'type': 'success',
-                                            'variant': 'tonal',
-                                            'text': '将“查看数据”列表中 “站点domain” => 站点管理 新增站点 站点名+ https://或http:// 直接新增'}
-                                    }
-                                ]
+                                    'model': 'onlyonce',
+                                    'label': '立即运行一次',
+                                    'hint': '打开后立即运行一次获取索引器列表，否则需要等到预先设置的更新周期才会获取'
+                                }
                             }
                         ]
                     },
                     {
-                        'component': 'VRow',
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 6
+                        },
                         'content': [
                             {
-                                'component': 'VCol',
+                                'component': 'VTextField',
                                 'props': {
-                                    'cols': 12,
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VAlert',
-                                        'props': {
-                                            'type': 'info',
-                                            'variant': 'tonal',
-                                            'text': '该种方式扩建检索，无法进行站点连通性监测，官方默认方式添加的正常不影响！'
-                                                    '日志出现报如下错误时，可以不用管，由于插件没有检索到数据会触发后续模块检索，导致错误'
-                                                    'indexer - 【ProwlarrExtend】ACG.RIP 搜索出错：NoneType object has no attribute get'
-                                        }
-                                    }
-                                ]
+                                    'model': 'cron',
+                                    'label': '更新周期',
+                                    'placeholder': '0 0 */24 * *',
+                                    'hint': '索引列表更新周期，支持5位cron表达式，默认每24小时运行一次'
+                                }
                             }
                         ]
                     }
-
                 ]
-            }
-        ], {
-            "host": "",
-            "api_key": "",
-            "cron": "0 0 */24 * *",
-            "onlyonce": False
-        }
-
-    def _ensure_sites_loaded(self) -> bool:
-        """
-        确保 self._indexers 已加载数据，若为空则尝试重新加载。
-        :return: 成功加载返回 True，否则 False
-        """
-        if isinstance(self._indexers, list) and len(self._indexers) > 0:
-            return True
-
-        # 尝试重新加载站点数据
-        self.get_status()
-
-        return isinstance(self._indexers, list) and len(self._indexers) > 0
-
-    def get_page(self) -> List[dict]:
-        """
-        拼装插件详情页面，需要返回页面配置，同时附带数据
-        """
-        if not self._ensure_sites_loaded():
-            return []
-
-        items = []
-        for site in self._indexers:
-            items.append({
-                'component': 'tr',
+            },
+            {
+                'component': 'VRow',
                 'content': [
                     {
-                        'component': 'td',
-                        'text': site.get("name")
-                    },
-                    {
-                        'component': 'td',
-                        'text': f"https://{site.get('domain')}"
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 6
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'host',
+                                    'label': 'Prowlarr地址',
+                                    'placeholder': 'http://127.0.0.1:9696',
+                                    'hint': 'Prowlarr访问地址和端口，如为https需加https://前缀。注意需要先在Prowlarr中添加搜刮器，同时勾选所有搜刮器后搜索一次，才能正常测试通过和使用'
+                                }
+                            }
+                        ]
                     },
                     {
-                        'component': 'td',
-                        'text': site.get("public")
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 6
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'api_key',
+                                    'label': 'Api Key',
+                                    'placeholder': '',
+                                    'hint': '在Prowlarr->Settings->General->Security-> API Key中获取'
+                                }
+                            }
+                        ]
                     }
                 ]
-            })
-
-        return [
+            },
             {
                 'component': 'VRow',
                 'content': [
                     {
                         'component': 'VCol',
                         'props': {
-                            'cols': 12
+                            'cols': 12,
+                            'md': 6
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'search_workers',
+                                    'label': '检索并发数',
+                                    'placeholder': '16',
+                                    'type': 'number',
+                                    'hint': '对同一主机同时进行的最大检索请求数'
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 6
                         },
                         'content': [
                             {
-                                'component': 'VTable',
+                                'component': 'VTextField',
                                 'props': {
-                                    'hover': True
-                                },
-                                'content': [
-                                    {
-                                        'component': 'thead',
-                                        'content': [
-                                            {
-                                                'component': 'tr',
-                                                'content': [
-                                                    {
-                                                        'component': 'th',
-                                                        'props': {
-                                                            'class': 'text-start ps-4'
-                                                        },
-                                                        'text': 'id'
-                                                    },
-                                                    {
-                                                        'component': 'th',
-                                                        'props': {
-                                                            'class': 'text-start ps-4'
-                                                        },
-                                                        'text': '站点名称'
-                                                    },
-                                                    {
-                                                        'component': 'th',
-                                                        'props': {
-                                                            'class': 'text-start ps-4'
-                                                        },
-                                                        'text': '是否公开'
-                                                    }
-                                                ]
-                                            }
-                                        ]
-                                    },
-                                    {
-                                        'component': 'tbody',
-                                        'content': items
-                                    }
-                                ]
+                                    'model': 'prefetch_pages',
+                                    'label': '预取页数',
+                                    'placeholder': '0',
+                                    'type': 'number',
+                                    'hint': '单独检索返回整页结果时在后台预取后续的页数，翻页时直接使用，0为不预取'
+                                }
                             }
                         ]
                     }
                 ]
             }
-        ]
+        ], {
+            "prefetch_pages": 0,
+            "batch_search": False
+        }
@@ -0,0 +1,2482 @@
+# _*_ coding: utf-8 _*_
+"""
+索引器扩展检索的公共核心：请求引擎、结果缓存、并发与限流、熔断与健康检查、检索指标，
+以及索引器注册、配置与详情页面等插件公共部分，Jackett、Prowlarr 插件只实现各自接口的适配。
+
+MoviePilot 按目录单独安装插件，插件之间不能互相导入，本文件在 jackettextend、prowlarrextend 目录中各保存一份，
+两份内容保持一致，修改后运行 scripts/check_core_sync.py 检查与同步。
+"""
+import asyncio
+import base64
+import binascii
+import bisect
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict, deque
+from concurrent.futures import CancelledError as FutureCancelledError, ThreadPoolExecutor, \
+    TimeoutError as FutureTimeoutError
+from itertools import accumulate
+from typing import List, Dict, Any, Tuple, Optional, Callable, Coroutine
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+from xml.etree.ElementTree import Element
+
+import pytz
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+from app.helper.sites import SitesHelper
+
+from app.core.context import TorrentInfo
+from app.log import logger
+from app.plugins import _PluginBase
+from app.core.config import settings
+from app.schemas import MediaType
+from app.utils.http import RequestUtils
+from app.utils.string import StringUtils
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class SearchCache:
+    """
+    检索结果缓存，按 TTL 过期，超出条目数或内存预算时按 LRU 淘汰，缓存内容为只读的 TorrentRecord
+    """
+
+    def __init__(self, ttl: int = 300, max_entries: int = 500, max_bytes: int = 32 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        # key -> (过期时间, 估算字节数, 记录列表)
+        self._data: "OrderedDict[tuple, Tuple[float, int, list]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0 and self.max_bytes > 0
+
+    @staticmethod
+    def make_key(indexer: str, keyword: str, categories: Optional[List[int]], page: Optional[int]) -> tuple:
+        """
+        生成缓存键：索引器、归一化关键词、分类、页码
+        """
+        return (str(indexer),
+                " ".join(str(keyword).lower().split()),
+                tuple(sorted(categories or [])),
+                page or 0)
+
+    def __contains__(self, key: tuple) -> bool:
+        """
+        是否存在未过期的缓存，不计入命中统计
+        """
+        if not self.enabled:
+            return False
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[0] > time.monotonic()
+
+    def get(self, key: tuple) -> Optional[list]:
+        """
+        读取缓存，未命中或已过期返回 None；返回新列表，记录本身只读，由调用方转换为 TorrentInfo
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, _, torrents = entry
+            if expires <= time.monotonic():
+                self.__pop(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        return list(torrents)
+
+    def set(self, key: tuple, torrents: list):
+        """
+        写入缓存，并按条目数、内存预算淘汰最久未使用的条目
+        """
+        if not self.enabled:
+            return
+        size = self.__estimate(torrents)
+        if size > self.max_bytes:
+            return
+        torrents = list(torrents)
+        with self._lock:
+            if key in self._data:
+                self.__pop(key)
+            self._data[key] = (time.monotonic() + self.ttl, size, torrents)
+            self._bytes += size
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted, _) = self._data.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        缓存统计信息
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total * 100, 1) if total else 0.0,
+            }
+
+    def __pop(self, key: tuple):
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    @staticmethod
+    def __estimate(torrents: list) -> int:
+        """
+        粗略估算记录列表占用的内存
+        """
+        size = sys.getsizeof(torrents)
+        for torrent in torrents:
+            size += sys.getsizeof(torrent)
+            for value in (torrent.title, torrent.description, torrent.enclosure, torrent.page_url):
+                if value:
+                    size += sys.getsizeof(value)
+        return size
+
+
+class TorrentDeduplicator:
+    """
+    检索结果去重：优先按 infohash（含磁力链接中的 btih）识别同一资源，缺少时按规范化标题 + 大小，
+    重复的资源只保留做种数最多的一份
+    """
+    _btih_pattern = re.compile(r"urn:btih:([0-9a-z]{40}|[2-7a-z]{32})", re.IGNORECASE)
+    _title_noise_pattern = re.compile(r"[\W_]+")
+
+    @classmethod
+    def infohash(cls, value: Optional[str]) -> Optional[str]:
+        """
+        规范化 infohash 为 40 位小写十六进制
+        :param value: infohash 或磁力链接
+        """
+        if not value:
+            return None
+        match = cls._btih_pattern.search(value)
+        value = (match.group(1) if match else value).strip()
+        if len(value) == 32:
+            try:
+                value = base64.b32decode(value.upper()).hex()
+            except (binascii.Error, ValueError):
+                return None
+        if len(value) != 40:
+            return None
+        return value.lower()
+
+    @classmethod
+    def key(cls, torrent: Any, infohash: Optional[str] = None) -> str:
+        """
+        资源的去重键
+        """
+        infohash = cls.infohash(infohash)
+        if not infohash and torrent.enclosure and torrent.enclosure.startswith("magnet:"):
+            infohash = cls.infohash(torrent.enclosure)
+        if infohash:
+            return infohash
+        title = cls._title_noise_pattern.sub("", (torrent.title or "").lower())
+        try:
+            size = round(float(torrent.size or 0) / 1024 / 1024)
+        except (TypeError, ValueError):
+            size = 0
+        return f"{title}|{size}"
+
+    @classmethod
+    def dedup(cls, items: list, torrent: Callable[[Any], Any] = lambda item: item,
+              infohash: Callable[[Any], Optional[str]] = lambda item: None) -> list:
+        """
+        去重并保持原有顺序
+        :param items: 待去重的列表，元素为 TorrentInfo、TorrentRecord 或包含它们的元组
+        :param torrent: 从元素中取 TorrentInfo 或 TorrentRecord
+        :param infohash: 从元素中取 infohash
+        """
+        best: Dict[str, Tuple[int, int]] = {}
+        for index, item in enumerate(items):
+            key = cls.key(torrent(item), infohash(item))
+            seeders = cls.__seeders(torrent(item))
+            kept = best.get(key)
+            if kept is None or seeders > kept[1]:
+                best[key] = (index, seeders)
+        if len(best) == len(items):
+            return items
+        keep = {index for index, _ in best.values()}
+        return [item for index, item in enumerate(items) if index in keep]
+
+    @staticmethod
+    def __seeders(torrent: Any) -> int:
+        try:
+            return int(float(torrent.seeders or 0))
+        except (TypeError, ValueError):
+            return 0
+
+
+class IndexerCaps:
+    """
+    索引器能力：各检索模式支持的参数及分类
+    """
+    # 检索模式 -> torznab caps 节点名
+    mode_tags = {"search": "search", "tvsearch": "tv-search", "movie": "movie-search"}
+    # 检索模式 -> Prowlarr capabilities 字段名
+    mode_fields = {"search": "searchParams", "tvsearch": "tvSearchParams", "movie": "movieSearchParams"}
+
+    __slots__ = ("modes", "categories", "updated_at")
+
+    def __init__(self, modes: Dict[str, List[str]], categories: Optional[List[int]] = None,
+                 updated_at: Optional[float] = None):
+        """
+        :param modes: 检索模式 -> 支持的参数（小写）
+        :param categories: 支持的分类 ID
+        :param updated_at: 获取时间
+        """
+        self.modes = modes
+        self.categories = categories or []
+        self.updated_at = updated_at or time.time()
+
+    def expired(self, ttl: int) -> bool:
+        return time.time() - self.updated_at > ttl
+
+    def filter_categories(self, categories: List[int]) -> List[int]:
+        """
+        过滤出索引器支持的分类，大类（如 2000）在索引器支持其任一子类时保留，索引器未声明分类时原样返回
+        """
+        if not self.categories:
+            return categories
+        supported = set(self.categories)
+        groups = {category // 1000 for category in self.categories}
+        return [category for category in categories
+                if category in supported or (category % 1000 == 0 and category // 1000 in groups)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"modes": self.modes, "categories": self.categories, "updated_at": self.updated_at}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IndexerCaps":
+        return cls(modes=data.get("modes") or {}, categories=data.get("categories") or [],
+                   updated_at=data.get("updated_at"))
+
+    def supports(self, mode: str, *params: str) -> bool:
+        """
+        是否支持指定的检索模式及参数
+        """
+        supported = self.modes.get(mode)
+        return supported is not None and all(param in supported for param in params)
+
+    @classmethod
+    def from_torznab(cls, root: Element) -> "IndexerCaps":
+        """
+        解析 torznab t=caps 返回的 XML
+        """
+        searching = root.find("searching")
+        # 未声明检索模式时视为只支持关键词检索
+        modes = {} if searching is not None else {"search": ["q"]}
+        for mode, tag in cls.mode_tags.items():
+            node = searching.find(tag) if searching is not None else None
+            if node is None or node.get("available") != "yes":
+                continue
+            modes[mode] = [param.strip().lower() for param in (node.get("supportedParams") or "q").split(",")
+                           if param.strip()]
+        categories = [int(node.get("id")) for node in root.iter("category") if (node.get("id") or "").isdigit()]
+        return cls(modes, categories)
+
+    @classmethod
+    def from_prowlarr(cls, capabilities: dict) -> "IndexerCaps":
+        """
+        解析 Prowlarr 索引器定义中的 capabilities
+        """
+        modes = {mode: [str(param).lower() for param in capabilities.get(field)]
+                 for mode, field in cls.mode_fields.items() if capabilities.get(field)}
+        categories = [category.get("id") for category in capabilities.get("categories") or []
+                      if isinstance(category, dict) and isinstance(category.get("id"), int)]
+        return cls(modes, categories)
+
+
+class SearchQuery:
+    """
+    检索请求：从关键词中识别 IMDb ID 与季集，按索引器能力选择 movie、tvsearch 检索，不支持时退回关键词检索
+    """
+    _imdbid_pattern = re.compile(r"^tt\d{7,9}$", re.IGNORECASE)
+    _season_pattern = re.compile(r"^(.+?)\s+S(\d{1,4})(?:E(\d{1,4}))?$", re.IGNORECASE)
+
+    __slots__ = ("mode", "keyword", "imdbid", "season", "episode")
+
+    def __init__(self, mode: str = "search", keyword: Optional[str] = None, imdbid: Optional[str] = None,
+                 season: Optional[int] = None, episode: Optional[int] = None):
+        self.mode = mode
+        self.keyword = keyword
+        self.imdbid = imdbid
+        self.season = season
+        self.episode = episode
+
+    @property
+    def key(self) -> tuple:
+        return self.mode, self.keyword, self.imdbid, self.season, self.episode
+
+    def __str__(self) -> str:
+        parts = [self.keyword or self.imdbid or ""]
+        if self.season is not None:
+            parts.append(f"S{self.season:02d}" + (f"E{self.episode:02d}" if self.episode is not None else ""))
+        return " ".join(parts) if self.mode == "search" else f"{self.mode}：{' '.join(parts)}"
+
+    @classmethod
+    def plan(cls, keyword: str, mtype: Optional[MediaType], caps: Optional[IndexerCaps]) -> "SearchQuery":
+        """
+        生成检索请求，未获取到索引器能力时使用关键词检索
+        """
+        fallback = cls(keyword=keyword)
+        if not caps:
+            return fallback
+        if mtype == MediaType.MOVIE:
+            modes = ["movie"]
+        elif mtype == MediaType.TV:
+            modes = ["tvsearch"]
+        else:
+            modes = ["movie", "tvsearch"]
+        # IMDb ID，媒体类型未知且电影、剧集检索都支持 ID 时无法判断类型，使用关键词检索
+        if cls._imdbid_pattern.match(keyword):
+            supported = [mode for mode in modes if caps.supports(mode, "imdbid")]
+            if len(supported) == 1:
+                return cls(supported[0], imdbid=keyword.lower())
+            return fallback
+        # 名称 + 季集
+        match = cls._season_pattern.match(keyword)
+        if match and mtype != MediaType.MOVIE:
+            episode = match.group(3)
+            if caps.supports("tvsearch", *(["q", "season", "ep"] if episode else ["q", "season"])):
+                return cls("tvsearch", keyword=match.group(1), season=int(match.group(2)),
+                           episode=int(episode) if episode else None)
+            return fallback
+        # 已知媒体类型时使用对应的检索模式
+        if mtype in (MediaType.MOVIE, MediaType.TV) and caps.supports(modes[0], "q"):
+            return cls(modes[0], keyword=keyword)
+        return fallback
+
+
+class SearchBatch:
+    """
+    一次合并检索的结果，在有效期内供同一轮检索的其它站点复用，仅在检索引擎的事件循环中使用
+    """
+
+    def __init__(self, ttl: int = 60):
+        self.expires = time.monotonic() + ttl
+        self._future = asyncio.get_running_loop().create_future()
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires
+
+    def resolve(self, buckets: Optional[Dict[str, list]]):
+        if not self._future.done():
+            self._future.set_result(buckets)
+
+    async def wait(self, timeout: Optional[float] = None) -> Optional[Dict[str, list]]:
+        """
+        等待合并检索完成，超时或失败返回 None
+        """
+        try:
+            return await asyncio.wait_for(asyncio.shield(self._future), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class SingleFlight:
+    """
+    合并进行中的相同请求：同一 key 的并发调用共享一次执行及其结果，执行结束即移除，不做缓存，
+    仅在检索引擎的事件循环中使用
+    """
+
+    def __init__(self):
+        # 被合并的调用次数
+        self.coalesced = 0
+        self._tasks: Dict[tuple, asyncio.Future] = {}
+
+    async def do(self, key: tuple, factory: Callable[[], Coroutine]) -> Any:
+        """
+        执行 factory 创建的协程，已有相同 key 的请求在进行中时等待其结果
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self.__forget(key, task))
+        else:
+            self.coalesced += 1
+        # 单个调用方超出检索时限被取消时，不影响共享同一请求的其它调用方
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "inflight": len(self._tasks),
+            "coalesced": self.coalesced,
+        }
+
+    def __forget(self, key: tuple, task: asyncio.Future):
+        if self._tasks.get(key) is task:
+            self._tasks.pop(key, None)
+
+
+class RequestTrace:
+    """
+    单次请求的跟踪信息，由检索引擎和解析过程填充
+    """
+    __slots__ = ("elapsed", "bytes", "parse_time", "status", "error")
+
+    def __init__(self):
+        self.elapsed = 0.0
+        self.bytes = 0
+        self.parse_time = 0.0
+        self.status = None
+        # 失败类型：timeout、error、parse
+        self.error = None
+
+
+class IndexerMetrics:
+    """
+    按索引器统计请求延迟分布、流量、解析耗时、结果数及错误、超时次数
+    """
+    # 延迟直方图分桶上限（秒），与 Prometheus 的 le 一致，每个桶为延迟不超过上限的累计请求数
+    buckets = (0.25, 0.5, 1, 2, 5, 10, 30, 60, float("inf"))
+    # 计算分位数使用的最近样本数
+    window = 200
+
+    def __init__(self):
+        self._data: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, trace: RequestTrace, results: int = 0):
+        """
+        记录一次请求
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                item = {
+                    "requests": 0,
+                    "errors": 0,
+                    "timeouts": 0,
+                    "results": 0,
+                    "bytes": 0,
+                    "latency": 0.0,
+                    "parse_time": 0.0,
+                    "histogram": [0] * len(self.buckets),
+                    "recent": deque(maxlen=self.window),
+                    "last_error": None,
+                    "last_time": None,
+                }
+                self._data[key] = item
+            item["requests"] += 1
+            item["results"] += results
+            item["bytes"] += trace.bytes
+            item["latency"] += trace.elapsed
+            item["parse_time"] += trace.parse_time
+            item["histogram"][bisect.bisect_left(self.buckets, trace.elapsed)] += 1
+            item["recent"].append(trace.elapsed)
+            if trace.error == "timeout":
+                item["timeouts"] += 1
+            elif trace.error:
+                item["errors"] += 1
+            if trace.error:
+                item["last_error"] = trace.error if not trace.status else f"{trace.error}({trace.status})"
+            item["last_time"] = time.time()
+
+    def percentile(self, key: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """
+        最近样本的延迟分位数
+        :param min_samples: 样本数少于该值时返回 None
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if not item or len(item["recent"]) < max(min_samples, 1):
+                return None
+            samples = sorted(item["recent"])
+        return samples[min(int(len(samples) * q), len(samples) - 1)]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        各索引器的统计汇总
+        """
+        with self._lock:
+            data = {key: (dict(item), sorted(item["recent"])) for key, item in self._data.items()}
+        summary = {}
+        for key, (item, samples) in data.items():
+            requests_count = item["requests"] or 1
+
+            def quantile(q: float) -> float:
+                return round(samples[min(int(len(samples) * q), len(samples) - 1)], 3) if samples else 0.0
+
+            summary[key] = {
+                "requests": item["requests"],
+                "errors": item["errors"],
+                "timeouts": item["timeouts"],
+                "error_rate": round(item["errors"] / requests_count * 100, 1),
+                "timeout_rate": round(item["timeouts"] / requests_count * 100, 1),
+                "results": item["results"],
+                "avg_results": round(item["results"] / requests_count, 1),
+                "bytes": item["bytes"],
+                "avg_latency": round(item["latency"] / requests_count, 3),
+                "p50": quantile(0.5),
+                "p95": quantile(0.95),
+                "p99": quantile(0.99),
+                "avg_parse_time": round(item["parse_time"] / requests_count, 3),
+                "histogram": {("+Inf" if bound == float("inf") else str(bound)): count
+                              for bound, count in zip(self.buckets, accumulate(item["histogram"]))},
+                "last_error": item["last_error"],
+                "last_time": datetime.fromtimestamp(item["last_time"]).strftime("%Y-%m-%d %H:%M:%S")
+                if item["last_time"] else None,
+            }
+        return summary
+
+
+class CircuitBreaker:
+    """
+    索引器熔断器：连续失败达到阈值后熔断，熔断期间跳过检索，
+    到达探测时间后由后台探测决定恢复或继续熔断，探测失败时探测间隔翻倍
+    """
+
+    def __init__(self, threshold: int = 3, cooldown: int = 300, max_cooldown: int = 3600):
+        """
+        :param threshold: 触发熔断的连续失败次数，0 为不熔断
+        :param cooldown: 熔断后首次探测的等待时间（秒）
+        :param max_cooldown: 探测间隔上限（秒）
+        """
+        self.threshold = threshold
+        self.cooldown = max(cooldown, 1)
+        self.max_cooldown = max(max_cooldown, self.cooldown)
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def allow(self, key: str) -> bool:
+        """
+        是否允许检索，熔断中返回 False
+        """
+        with self._lock:
+            state = self._states.get(key)
+            return not state or not state["open"]
+
+    def record(self, key: str, ok: bool) -> Optional[str]:
+        """
+        记录一次请求结果
+        :return: 状态变化，open 为触发熔断，closed 为恢复，无变化返回 None
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            state = self._states.get(key)
+            if ok:
+                if state is None:
+                    return None
+                self._states.pop(key, None)
+                return "closed" if state["open"] else None
+            if state is None:
+                state = {"open": False, "failures": 0, "cooldown": self.cooldown, "retry_at": 0.0}
+                self._states[key] = state
+            state["failures"] += 1
+            if state["open"]:
+                # 熔断中仍然失败，延长探测间隔
+                state["cooldown"] = min(state["cooldown"] * 2, self.max_cooldown)
+                state["retry_at"] = time.time() + state["cooldown"]
+                return None
+            if state["failures"] >= self.threshold:
+                state["open"] = True
+                state["retry_at"] = time.time() + state["cooldown"]
+                return "open"
+            return None
+
+    def due(self) -> List[str]:
+        """
+        取出已到达探测时间的熔断索引器，并顺延其探测时间，避免探测未结束时被重复取出
+        """
+        now = time.time()
+        keys = []
+        with self._lock:
+            for key, state in self._states.items():
+                if state["open"] and state["retry_at"] <= now:
+                    state["retry_at"] = now + state["cooldown"]
+                    keys.append(key)
+        return keys
+
+    def clear(self):
+        with self._lock:
+            self._states.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        各索引器的熔断状态
+        """
+        with self._lock:
+            return {
+                key: {
+                    "state": "open" if state["open"] else "closed",
+                    "failures": state["failures"],
+                    "retry_at": datetime.fromtimestamp(state["retry_at"]).strftime("%Y-%m-%d %H:%M:%S")
+                    if state["open"] else None
+                } for key, state in self._states.items()
+            }
+
+
+class RateLimiter:
+    """
+    令牌桶限流：分别按索引器和主机限速，令牌不足时排队等待而不是丢弃请求。
+    每次取令牌即预约一个发放时刻并返回需要等待的时长，检索引擎中的异步请求与同步请求共用同一组令牌桶
+    """
+
+    def __init__(self, indexer_rate: float = 0, host_rate: float = 0, indexer_burst: int = 3, host_burst: int = 1):
+        """
+        :param indexer_rate: 每个索引器每秒发放的令牌数，0 为不限速
+        :param host_rate: 每个主机每秒发放的令牌数，0 为不限速
+        :param indexer_burst: 索引器令牌桶容量，即允许的突发请求数
+        :param host_burst: 主机令牌桶容量
+        """
+        self.indexer_rate = indexer_rate
+        self.host_rate = host_rate
+        self.indexer_burst = max(indexer_burst, 1)
+        self.host_burst = max(host_burst, 1)
+        # 排队等待的请求数及累计等待时长（秒）
+        self.throttled = 0
+        self.waited = 0.0
+        # (类型, key) -> (剩余令牌数, 更新时间)，更新时间为最近一次预约的发出时刻，可能晚于当前时间
+        self._buckets: Dict[tuple, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.indexer_rate > 0 or self.host_rate > 0
+
+    def reserve(self, url: str, keys: Optional[List[str]] = None) -> float:
+        """
+        为一次请求预约令牌
+        :param url: 请求地址，按其主机限速
+        :param keys: 请求涉及的索引器，为空时只按主机限速
+        :return: 需要等待的时长（秒）
+        """
+        if not self.enabled:
+            return 0.0
+        now = time.monotonic()
+        buckets = [(("indexer", key), self.indexer_rate, self.indexer_burst)
+                   for key in (keys or [] if self.indexer_rate > 0 else [])]
+        if self.host_rate > 0:
+            buckets.append((("host", urlsplit(url).netloc), self.host_rate, self.host_burst))
+        with self._lock:
+            # 先求出各令牌桶都有令牌的发出时刻，再统一在该时刻取令牌，避免预约的时刻与实际发出时刻不一致
+            fire = max([self.__available(*bucket, now) for bucket in buckets], default=now)
+            for bucket in buckets:
+                self.__take(*bucket, fire)
+            delay = fire - now
+            if delay > 0:
+                self.throttled += 1
+                self.waited += delay
+        return delay
+
+    def wait(self, url: str, keys: Optional[List[str]] = None):
+        """
+        同步请求前排队等待令牌
+        """
+        delay = self.reserve(url, keys)
+        if delay > 0:
+            time.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "throttled": self.throttled,
+                "waited": round(self.waited, 2),
+            }
+
+    def __available(self, key: tuple, rate: float, burst: int, now: float) -> float:
+        """
+        令牌桶可取出下一个令牌的最早时刻
+        """
+        tokens, updated = self._buckets.get(key, (burst, now))
+        start = max(now, updated)
+        tokens = min(burst, tokens + (start - updated) * rate)
+        return start + max(0.0, (1 - tokens) / rate)
+
+    def __take(self, key: tuple, rate: float, burst: int, at: float):
+        """
+        在 at 时刻取出一个令牌，at 不早于 __available 返回的时刻
+        """
+        tokens, updated = self._buckets.get(key, (burst, at))
+        self._buckets[key] = (min(burst, tokens + (at - updated) * rate) - 1, at)
+
+
+class IndexerHealth:
+    """
+    索引器健康状态快照，由后台健康检查更新，详情页直接读取
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, status: str, latency: Optional[float] = None, error: Optional[str] = None):
+        """
+        记录一次检查结果
+        :param status: ok 正常，error 异常，open 已熔断未检查
+        :param latency: 请求耗时（秒）
+        """
+        with self._lock:
+            self._data[key] = {
+                "status": status,
+                "latency": round(latency, 3) if latency is not None else None,
+                "error": error,
+                "checked_at": time.time(),
+            }
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._data.get(key)
+            return dict(item) if item else None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        各索引器最近一次检查结果
+        """
+        with self._lock:
+            return {
+                key: {
+                    **item,
+                    "checked_at": datetime.fromtimestamp(item["checked_at"]).strftime("%Y-%m-%d %H:%M:%S")
+                } for key, item in self._data.items()
+            }
+
+
+class AsyncSearchEngine:
+    """
+    异步检索引擎：在独立线程中运行一个事件循环，所有关键词、索引器的请求都在该循环上并发执行，
+    并按主机限制并发数。同步调用方通过 run() 桥接。
+    安装了 httpx 时使用其异步客户端，否则将阻塞请求交给线程池执行。
+    """
+
+    # 需要重试的状态码
+    retry_status = (429, 502, 503, 504)
+
+    def __init__(self, name: str, per_host_limit: int = 4, timeout: float = 60,
+                 proxies: Optional[dict] = None, session: Optional[requests.Session] = None,
+                 executor: Optional[ThreadPoolExecutor] = None, max_retries: int = 2,
+                 retry_backoff: float = 0.5, chunk_size: int = 64 * 1024,
+                 limiter: Optional[RateLimiter] = None):
+        self.name = name
+        self.per_host_limit = max(per_host_limit, 1)
+        self.timeout = timeout
+        self.proxies = proxies
+        self.session = session
+        self.executor = executor
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.chunk_size = chunk_size
+        self.limiter = limiter
+        self._client = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.__run_loop, name=f"{name}-engine", daemon=True)
+        # 开始关闭后不再接受新的协程，避免提交到已停止的事件循环后永远等不到结果
+        self._closing = False
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._loop.is_running() and not self._closing
+
+    def start(self):
+        """
+        启动事件循环线程并创建异步客户端
+        """
+        self._thread.start()
+        if httpx:
+            self.run(self.__open_client())
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        在事件循环中执行协程并阻塞等待结果
+        :param timeout: 最长等待时间（秒），超时后取消协程并抛出 TimeoutError
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("不能在检索引擎线程中同步等待")
+        with self._lock:
+            if self._closing:
+                coro.close()
+                raise RuntimeError("检索引擎已关闭")
+            future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+        except FutureCancelledError:
+            # 关闭检索引擎时取消了未完成的协程
+            raise RuntimeError("检索引擎已关闭")
+
+    def close(self):
+        """
+        取消未完成的请求，关闭客户端并停止事件循环
+        """
+        with self._lock:
+            if self._closing or not self._loop.is_running():
+                return
+            self._closing = True
+        try:
+            asyncio.run_coroutine_threadsafe(self.__shutdown(), self._loop).result(10)
+        except Exception as e:
+            logger.debug(f"【{self.name}】关闭检索引擎出错：{str(e)}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=10)
+        if not self.running:
+            self._loop.close()
+
+    async def fetch(self, url: str, headers: Optional[dict] = None, timeout: Optional[float] = None,
+                    on_chunk: Optional[Callable[[bytes], None]] = None,
+                    trace: Optional[RequestTrace] = None,
+                    rate_keys: Optional[List[str]] = None) -> Optional[bytes]:
+        """
+        GET 请求，启用限流时先排队等待令牌
+        :param on_chunk: 流式处理响应数据块的回调，指定后不再返回响应内容
+        :param trace: 请求跟踪信息，记录耗时、流量与失败类型
+        :param rate_keys: 请求涉及的索引器，用于按索引器限流
+        :return: 响应内容（流式处理时为 b""），请求失败或状态码异常返回 None
+        """
+        trace = trace or RequestTrace()
+        if self.limiter:
+            delay = self.limiter.reserve(url, rate_keys)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        async with self.__host_limit(url):
+            started = time.monotonic()
+            try:
+                if self._client:
+                    return await self.__fetch_async(url, headers, timeout or self.timeout, on_chunk, trace)
+                return await asyncio.get_running_loop().run_in_executor(
+                    self.executor, self.__fetch_sync, url, headers, timeout or self.timeout, on_chunk, trace)
+            finally:
+                trace.elapsed = time.monotonic() - started
+
+    async def hedge(self, factory: Callable[[], Coroutine], delay: Optional[float] = None) -> Any:
+        """
+        对冲请求：首个请求超过 delay 秒仍未完成时再发起一个相同的请求，取先成功返回的结果，另一个取消
+        :param factory: 创建请求协程的函数，请求失败时协程应返回 None
+        :param delay: 发起对冲请求前的等待时间（秒），为空时不对冲
+        :return: 先返回的非 None 结果，全部失败返回 None
+        """
+        tasks = [asyncio.ensure_future(factory())]
+        try:
+            if delay:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    logger.debug(f"【{self.name}】请求超过 {round(delay, 2)}s 未返回，发起对冲请求")
+                    tasks.append(asyncio.ensure_future(factory()))
+            for task in asyncio.as_completed(tasks):
+                try:
+                    result = await task
+                except Exception as e:
+                    logger.debug(f"【{self.name}】请求出错：{str(e)}")
+                    continue
+                if result is not None:
+                    return result
+            return None
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def __run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    async def __open_client(self):
+        proxy = None
+        if self.proxies:
+            proxy = self.proxies.get("https") or self.proxies.get("http")
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=self.per_host_limit * 4)
+        try:
+            self._client = httpx.AsyncClient(proxy=proxy, limits=limits, verify=False, follow_redirects=True)
+        except TypeError:
+            # 旧版本 httpx 使用 proxies 参数
+            self._client = httpx.AsyncClient(proxies=proxy, limits=limits, verify=False, follow_redirects=True)
+
+    async def __shutdown(self):
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    def __host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        limit = self._host_limits.get(host)
+        if not limit:
+            limit = asyncio.Semaphore(self.per_host_limit)
+            self._host_limits[host] = limit
+        return limit
+
+    async def __fetch_async(self, url: str, headers: Optional[dict], timeout: float,
+                            on_chunk: Optional[Callable[[bytes], None]],
+                            trace: RequestTrace) -> Optional[bytes]:
+        for attempt in range(self.max_retries + 1):
+            retry = attempt < self.max_retries
+            try:
+                async with self._client.stream("GET", url, headers=headers, timeout=timeout) as response:
+                    trace.status = response.status_code
+                    if response.status_code in self.retry_status and retry:
+                        logger.debug(f"【{self.name}】请求返回 {response.status_code}，准备重试")
+                    elif response.status_code >= 400:
+                        logger.debug(f"【{self.name}】请求返回 {response.status_code}")
+                        trace.error = "error"
+                        return None
+                    elif on_chunk is None:
+                        content = await response.aread()
+                        trace.bytes = len(content)
+                        return content
+                    else:
+                        async for chunk in response.aiter_bytes(self.chunk_size):
+                            trace.bytes += len(chunk)
+                            on_chunk(chunk)
+                        return b""
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                if not retry:
+                    logger.debug(f"【{self.name}】连接失败：{str(e)}")
+                    trace.error = "timeout" if isinstance(e, httpx.TimeoutException) else "error"
+                    return None
+            except httpx.HTTPError as e:
+                logger.debug(f"【{self.name}】请求失败：{str(e)}")
+                trace.error = "timeout" if isinstance(e, httpx.TimeoutException) else "error"
+                return None
+            await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+        return None
+
+    def __fetch_sync(self, url: str, headers: Optional[dict], timeout: float,
+                     on_chunk: Optional[Callable[[bytes], None]],
+                     trace: RequestTrace) -> Optional[bytes]:
+        ret = None
+        try:
+            ret = RequestUtils(headers=headers, session=self.session, timeout=timeout).get_res(url,
+                                                                                              proxies=self.proxies,
+                                                                                              stream=True,
+                                                                                              raise_exception=True)
+            if ret is None:
+                trace.error = "error"
+                return None
+            trace.status = ret.status_code
+            if not ret:
+                trace.error = "error"
+                return None
+            if on_chunk is None:
+                content = ret.content
+                trace.bytes = len(content)
+                return content
+            for chunk in ret.iter_content(chunk_size=self.chunk_size):
+                trace.bytes += len(chunk)
+                on_chunk(chunk)
+            return b""
+        except requests.exceptions.Timeout:
+            trace.error = "timeout"
+            return None
+        except requests.exceptions.RequestException:
+            trace.error = "error"
+            return None
+        finally:
+            if ret is not None:
+                ret.close()
+
+
+class _IndexerPluginBase(_PluginBase):
+    """
+    索引器扩展检索插件的公共部分：读取配置、创建检索组件与定时任务、索引器列表与能力的本地保存和 SitesHelper 注册、
+    关键词检索的缓存与合并、熔断探测与健康检查、检索指标及配置、详情页面。
+    子类实现 get_indexers、_fetch_keyword、_fetch_all_caps、_ping_url、_search_headers，按需扩展配置项与表单。
+    类名以下划线开头，MoviePilot 加载插件时不会将其识别为插件
+    """
+    # 上游服务名称，用于日志与页面文字
+    _backend = ""
+
+    # 私有属性
+    _scheduler = None
+    _cron = None
+    _enabled = False
+    _proxy = False
+    _host = ""
+    _api_key = ""
+    _onlyonce = False
+    _search_workers = 16
+    _cache_ttl = 300
+    _cache_max_entries = 500
+    _cache_max_mb = 32
+    _indexers = []
+    # 合并检索：同一关键词只向上游请求一次，结果拆分后供本轮各站点复用
+    _batch_search = False
+    _batches = {}
+    # 进行中的相同检索
+    _inflight = None
+    _engine = None
+    _catalog_etag = None
+    _metrics = None
+    # 索引器能力，indexer id -> IndexerCaps
+    _caps = {}
+    _breaker = None
+    _breaker_threshold = 3
+    _breaker_cooldown = 300
+    _search_deadline = 0
+    _hedge_requests = False
+    _dedup = False
+    # 健康检查间隔（分钟），0 为不检查
+    _health_interval = 15
+    _health = None
+    # 每个索引器每分钟、每个主机每秒的请求数上限，0 为不限速
+    _rate_limit = 0
+    _host_rate_limit = 0
+    _limiter = None
+    # 已同步到 SitesHelper 的索引器快照，domain -> indexer
+    _registered = {}
+    _cache = None
+    _executor = None
+    _session = None
+    sites_helper = None
+    # 检索请求超时时间（秒），也是自适应超时的上限
+    _timeout = 60
+    # 自适应超时：最近 P95 延迟的倍数、超时下限（秒）及启用所需的最少样本数
+    _timeout_factor = 3
+    _min_timeout = 5
+    _adaptive_min_samples = 5
+    # 熔断探测间隔上限（秒）与探测任务的执行周期（秒）
+    _breaker_max_cooldown = 3600
+    _probe_interval = 60
+    # 本地索引器列表的存储键与格式版本
+    _catalog_key = "indexer_catalog"
+    _catalog_version = 1
+    # 索引器能力的存储键与有效期（秒），过期后在下次刷新索引器列表时重新获取
+    _caps_key = "indexer_caps"
+    _caps_ttl = 24 * 3600
+    # 连接池缓存的主机数
+    _pool_connections = 4
+    # 单个主机最大保持的连接数
+    _pool_maxsize = 16
+    # 连接失败与限流、网关错误的重试次数
+    _max_retries = 2
+    # 重试退避系数（秒）
+    _retry_backoff = 0.5
+    # 合并检索结果保留时长（秒），覆盖同一轮检索中各站点的调用
+    _batch_ttl = 60
+    # 等待其它站点发起的合并检索的最长时间（秒）
+    _batch_wait_timeout = 90
+    # 流式读取响应的分块大小
+    _chunk_size = 64 * 1024
+
+    def init_plugin(self, config: dict = None):
+        """
+        初始化插件
+        """
+        self.sites_helper = SitesHelper()
+        # 读取配置
+        if config:
+            self._read_config(config)
+        if not self._enabled:
+            return
+        # 停止现有任务
+        self.stop_service()
+        self._init_components()
+
+        # 启动定时任务 & 立即运行一次
+        self._scheduler = BackgroundScheduler(timezone=settings.TZ)
+        if self._cron:
+            logger.info(f"【{self.plugin_name}】 索引更新服务启动，周期：{self._cron}")
+            self._scheduler.add_job(self.get_status, CronTrigger.from_crontab(self._cron))
+        if self._breaker.enabled:
+            self._scheduler.add_job(self.__probe_indexers, 'interval', seconds=self._probe_interval)
+        if self._health_interval > 0:
+            # 首次检查在启动刷新索引器列表之后执行，详情页尽快有数据
+            self._scheduler.add_job(self.__check_health, 'interval', minutes=self._health_interval,
+                                    next_run_time=datetime.now(tz=pytz.timezone(settings.TZ)) + timedelta(seconds=15))
+
+        if self._onlyonce:
+            logger.info(f"【{self.plugin_name}】开始获取索引器状态")
+            # 关闭一次性开关
+            self._onlyonce = False
+            self.update_config(self._config_values())
+        # 先使用本地保存的索引器列表，启动时不等待上游响应，再在后台刷新
+        if not self._indexers:
+            self.__load_catalog()
+        self.__load_caps()
+        self.__sync_indexers()
+        self._scheduler.add_job(self.get_status, 'date',
+                                run_date=datetime.now(tz=pytz.timezone(settings.TZ)) + timedelta(seconds=3))
+
+        # 启动服务
+        self._scheduler.print_jobs()
+        self._scheduler.start()
+
+    def _read_config(self, config: dict):
+        """
+        读取配置，子类读取各自的配置项后调用
+        """
+        self._host = config.get("host")
+        if self._host:
+            if not self._host.startswith('http'):
+                self._host = "http://" + self._host
+            if self._host.endswith('/'):
+                self._host = self._host.rstrip('/')
+        self._api_key = config.get("api_key")
+        self._enabled = config.get("enabled")
+        self._proxy = config.get("proxy")
+        self._onlyonce = config.get("onlyonce")
+        self._cron = config.get("cron") or "0 0 */24 * *"
+        self._search_workers = self._to_int(config.get("search_workers"), 16)
+        self._timeout = self._to_int(config.get("timeout"), 60) or 60
+        self._breaker_threshold = self._to_int(config.get("breaker_threshold"), 3)
+        self._breaker_cooldown = self._to_int(config.get("breaker_cooldown"), 300)
+        self._search_deadline = self._to_int(config.get("search_deadline"), 0)
+        self._hedge_requests = config.get("hedge_requests")
+        self._dedup = config.get("dedup")
+        self._health_interval = self._to_int(config.get("health_interval"), 15)
+        self._rate_limit = self._to_int(config.get("rate_limit"), 0)
+        self._host_rate_limit = self._to_int(config.get("host_rate_limit"), 0)
+        self._cache_ttl = self._to_int(config.get("cache_ttl"), 300)
+        self._cache_max_entries = self._to_int(config.get("cache_max_entries"), 500)
+        self._cache_max_mb = self._to_int(config.get("cache_max_mb"), 32)
+
+    def _config_values(self) -> Dict[str, Any]:
+        """
+        当前配置，关闭一次性开关时写回，子类补充各自的配置项
+        """
+        return {
+            "onlyonce": False,
+            "cron": self._cron,
+            "host": self._host,
+            "api_key": self._api_key,
+            "search_workers": self._search_workers,
+            "timeout": self._timeout,
+            "breaker_threshold": self._breaker_threshold,
+            "breaker_cooldown": self._breaker_cooldown,
+            "search_deadline": self._search_deadline,
+            "hedge_requests": self._hedge_requests,
+            "health_interval": self._health_interval,
+            "rate_limit": self._rate_limit,
+            "host_rate_limit": self._host_rate_limit,
+            "dedup": self._dedup,
+            "cache_ttl": self._cache_ttl,
+            "cache_max_entries": self._cache_max_entries,
+            "cache_max_mb": self._cache_max_mb,
+        }
+
+    def _init_components(self):
+        """
+        创建连接池、限流、熔断、缓存与检索引擎等组件，子类创建各自的组件后调用
+        """
+        # 未安装 httpx 时执行阻塞请求的线程池
+        self._executor = ThreadPoolExecutor(max_workers=max(self._search_workers, 1),
+                                            thread_name_prefix=self.plugin_name)
+        # 插件内所有请求复用的连接池会话
+        self._session = self._create_session()
+        # 请求限流，检索与刷新共用
+        self._limiter = RateLimiter(indexer_rate=self._rate_limit / 60,
+                                    host_rate=self._host_rate_limit,
+                                    host_burst=self._host_rate_limit)
+        # 索引器检索指标
+        self._metrics = IndexerMetrics()
+        # 索引器能力
+        self._caps = {}
+        # 索引器健康状态
+        self._health = IndexerHealth()
+        # 索引器熔断
+        self._breaker = CircuitBreaker(threshold=self._breaker_threshold,
+                                       cooldown=self._breaker_cooldown,
+                                       max_cooldown=self._breaker_max_cooldown)
+        # 检索结果缓存
+        self._cache = SearchCache(ttl=self._cache_ttl,
+                                  max_entries=self._cache_max_entries,
+                                  max_bytes=self._cache_max_mb * 1024 * 1024)
+        # 合并检索
+        self._batches = {}
+        # 合并进行中的相同检索
+        self._inflight = SingleFlight()
+        # 异步检索引擎
+        self._engine = AsyncSearchEngine(name=self.plugin_name,
+                                         per_host_limit=self._search_workers,
+                                         timeout=self._timeout,
+                                         proxies=settings.PROXY if self._proxy else None,
+                                         session=self._session,
+                                         executor=self._executor,
+                                         max_retries=self._max_retries,
+                                         retry_backoff=self._retry_backoff,
+                                         chunk_size=self._chunk_size,
+                                         limiter=self._limiter)
+        self._engine.start()
+
+    def get_status(self):
+        """
+        检查连通性
+        :return: True、False
+        """
+        if not self._api_key or not self._host:
+            return False
+        indexers = self.get_indexers()
+        if not indexers:
+            if self._indexers:
+                logger.warning(f"【{self.plugin_name}】未获取到索引器，继续使用上次的索引器列表")
+            return False
+        self._indexers = indexers
+        self.__save_catalog()
+        self.__sync_indexers()
+        self.__refresh_caps()
+        return True
+
+    def get_indexers(self) -> List[dict]:
+        """
+        获取上游配置的索引器
+        :return: Indexer 列表，每项包含 id、name、url、domain、public、proxy
+        """
+        raise NotImplementedError
+
+    def _indexer_keys(self) -> List[str]:
+        """
+        全部索引器的 id，即注册的 domain 的最后一段
+        """
+        keys = [indexer.get("domain", "").split(".")[-1] for indexer in self._indexers or []]
+        return [key for key in keys if key]
+
+    def __sync_indexers(self):
+        """
+        将索引器变更增量同步到 SitesHelper：只注册新增和变更的索引器，已移除的索引器不再参与检索
+        """
+        current = {indexer.get("domain"): indexer for indexer in self._indexers if indexer.get("domain")}
+        previous = self._registered
+        added = [domain for domain in current if domain not in previous]
+        changed = [domain for domain in current if domain in previous and current[domain] != previous[domain]]
+        removed = [domain for domain in previous if domain not in current]
+        for domain in added + changed:
+            self.sites_helper.add_indexer(domain, dict(current[domain]))
+        self._registered = current
+        if added or changed or removed:
+            logger.info(f"【{self.plugin_name}】索引器同步完成，新增 {len(added)} 个，"
+                        f"变更 {len(changed)} 个，移除 {len(removed)} 个")
+
+    def __load_catalog(self) -> bool:
+        """
+        读取本地保存的索引器列表
+        """
+        catalog = self.get_data(self._catalog_key)
+        if not isinstance(catalog, dict) \
+                or catalog.get("version") != self._catalog_version \
+                or catalog.get("host") != self._host:
+            return False
+        indexers = catalog.get("indexers")
+        if not isinstance(indexers, list) or not indexers:
+            return False
+        self._indexers = indexers
+        self._catalog_etag = catalog.get("etag")
+        logger.info(f"【{self.plugin_name}】已加载本地索引器列表：{len(indexers)} 个，更新于 {catalog.get('updated_at')}")
+        return True
+
+    def __save_catalog(self):
+        """
+        保存索引器列表，内容未变化时跳过
+        """
+        etag = hashlib.sha1(json.dumps(self._indexers, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        if etag == self._catalog_etag:
+            return
+        self.save_data(self._catalog_key, {
+            "version": self._catalog_version,
+            "etag": etag,
+            "host": self._host,
+            "updated_at": datetime.now(tz=pytz.timezone(settings.TZ)).strftime("%Y-%m-%d %H:%M:%S"),
+            "indexers": self._indexers
+        })
+        self._catalog_etag = etag
+
+    def __load_caps(self):
+        """
+        读取本地保存的索引器能力，过期的能力仍可使用，直到下次刷新成功
+        """
+        data = self.get_data(self._caps_key)
+        if not isinstance(data, dict) or data.get("host") != self._host or not isinstance(data.get("caps"), dict):
+            return
+        self._caps = {key: IndexerCaps.from_dict(value) for key, value in data["caps"].items()
+                      if isinstance(value, dict)}
+
+    def __save_caps(self):
+        self.save_data(self._caps_key, {
+            "host": self._host,
+            "caps": {key: caps.to_dict() for key, caps in self._caps.items()}
+        })
+
+    def get_state(self) -> bool:
+        return self._enabled
+
+    def stop_service(self):
+        """
+        退出插件
+        """
+        try:
+            if self._engine:
+                self._engine.close()
+                self._engine = None
+            if self._scheduler:
+                self._scheduler.remove_all_jobs()
+                if self._scheduler.running:
+                    self._scheduler.shutdown()
+                self._scheduler = None
+            if self._executor:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if self._session:
+                self._session.close()
+                self._session = None
+        except Exception as e:
+            logger.error(f"【{self.plugin_name}】停止插件错误: {str(e)}")
+
+    def search_torrents(self, site, keywords, mtype: Optional[MediaType] = None, page: Optional[int] = 0) -> List[
+        TorrentInfo]:
+        """
+        根据关键字检索种子
+        """
+        results = []
+
+        if not site or site.get("name", "").split("-")[0] != self.plugin_name:
+            return results
+
+        # 提取 Indexer ID
+        domain = StringUtils.get_url_domain(site.get("domain", ""))
+        indexer_id = domain.split(".")[-1] if domain else ""
+        if not indexer_id:
+            logger.warning(f"【{self.plugin_name}】无法提取索引 ID，跳过站点：{site.get('name')}")
+            return results
+        if self._registered and domain not in self._registered:
+            logger.warning(f"【{self.plugin_name}】{site.get('name')} 已从 {self._backend} 中移除，跳过检索")
+            return results
+
+        categories = self.get_cat(mtype)
+        keywords = [keyword for keyword in keywords or [] if keyword]
+        if not keywords:
+            return results
+
+        if not self._engine or not self._engine.running:
+            logger.warning(f"【{self.plugin_name}】检索引擎未启动")
+            return results
+        try:
+            records = self._engine.run(self.__search(site, indexer_id, keywords, categories, page or 0, mtype),
+                                       timeout=self._run_timeout())
+            return [self._to_torrent(record) for record in records]
+        except FutureTimeoutError:
+            logger.warning(f"【{self.plugin_name}】{site.get('name')} 检索超过 {self._run_timeout()} 秒未完成，已取消")
+            return results
+        except Exception as e:
+            logger.error(f"【{self.plugin_name}】检索出错：{str(e)}")
+            return results
+
+    def _run_timeout(self) -> float:
+        """
+        同步等待检索引擎的最长时间（秒）：设置了检索时限时为时限加余量，否则为单个请求含重试的最长耗时加余量
+        """
+        if self._search_deadline > 0:
+            return self._search_deadline + 10
+        return self._timeout * (self._max_retries + 1) + 30
+
+    def _to_torrent(self, record) -> TorrentInfo:
+        """
+        将检索记录转换为返回给调用方的 TorrentInfo
+        """
+        return record.to_torrent()
+
+    async def __search(self, site: dict, indexer_id: str, keywords: List[str], categories: List[int],
+                       page: int, mtype: Optional[MediaType] = None) -> list:
+        """
+        在检索引擎中并发检索全部关键词，结果按关键词顺序合并，设置了检索时限时只返回时限内完成的部分
+        """
+        return await self.__gather_until_deadline([self.__search_keyword(site, indexer_id, keyword, categories,
+                                                                         page, mtype)
+                                                    for keyword in keywords],
+                                                   label=site.get("name"))
+
+    async def __search_keyword(self, site: dict, indexer_id: str, keyword: str, categories: List[int],
+                               page: int, mtype: Optional[MediaType] = None) -> list:
+        """
+        检索单个关键词
+        """
+        cache_key = SearchCache.make_key(indexer_id, keyword, categories, page)
+        if self._cache:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"【{self.plugin_name}】{site.get('name')} 关键词：{keyword} 命中缓存：{len(cached)} 条")
+                return cached
+        # 相同站点、关键词、分类、页码的检索正在进行时共享其结果
+        return list(await self._inflight.do(cache_key, lambda: self._fetch_keyword(site, indexer_id, keyword,
+                                                                                  categories, page, mtype,
+                                                                                  cache_key)))
+
+    async def _fetch_keyword(self, site: dict, indexer_id: str, keyword: str, categories: List[int],
+                             page: int, mtype: Optional[MediaType], cache_key: tuple) -> list:
+        """
+        向上游检索单个关键词并写入缓存，开启合并检索时优先使用合并检索的结果，其次使用预取的页
+        :return: 检索记录列表，失败返回空列表
+        """
+        if self._breaker and not self._breaker.allow(indexer_id):
+            logger.info(f"【{self.plugin_name}】Indexer：\"{site.get('name')}\" 已熔断，跳过检索")
+            return []
+        if self._batch_search:
+            # 合并检索供本轮所有站点复用，发起方超出检索时限时也不取消
+            buckets = await asyncio.shield(self.__batch_search(indexer_id, keyword, categories, page, mtype))
+            # 所在分组的合并检索失败时退回单独检索
+            if buckets is not None and indexer_id in buckets:
+                results = list(buckets[indexer_id])
+                logger.info(f"【{self.plugin_name}】Indexer：\"{site.get('name')}\" 关键词：\"{keyword}\" "
+                            f"合并检索结果：{len(results)} 条")
+                return results
+        try:
+            plan = self._plan(indexer_id, keyword, mtype, categories)
+            if not plan:
+                logger.info(f"【{self.plugin_name}】Indexer：\"{site.get('name')}\" 不支持该类型的检索，跳过")
+                return []
+            query, search_categories = plan
+            items = await self._take_prefetched(cache_key)
+            if items is not None:
+                logger.info(f"【{self.plugin_name}】Indexer：\"{site.get('name')}\" 关键词：\"{query}\" "
+                            f"第 {page + 1} 页使用预取结果")
+            else:
+                logger.info(f"【{self.plugin_name}】开始检索 Indexer：\"{site.get('name')}\"，关键词：\"{query}\"")
+                items = await self._engine.hedge(lambda: self._request([indexer_id], query, search_categories, page,
+                                                                       metric_key=indexer_id),
+                                                 delay=self._hedge_delay(indexer_id))
+                self._record_health(indexer_id, items is not None)
+            if items is None:
+                logger.warning(f"【{self.plugin_name}】Indexer：\"{site.get('name')}\" 返回为空或数据格式异常")
+                return []
+            self._on_page([indexer_id], keyword, categories, page, len(items))
+            self._prefetch(indexer_id, keyword, categories, query, search_categories, page, len(items))
+
+            results = self._dedup_items(items)
+            if self._cache:
+                self._cache.set(cache_key, results)
+            if not results:
+                logger.warning(f"【{self.plugin_name}】Indexer：\"{site.get('name')}\" 未检索到数据")
+            else:
+                logger.info(f"【{self.plugin_name}】Indexer：\"{site.get('name')}\" 返回数据：{len(results)} 条")
+            return results
+        except Exception as e:
+            self._record_health(indexer_id, False)
+            logger.error(f"【{self.plugin_name}】检索出错：{str(e)}\n{traceback.format_exc()}")
+            return []
+
+    async def __batch_search(self, indexer_id: str, keyword: str, categories: List[int], page: int,
+                             mtype: Optional[MediaType] = None) -> Optional[Dict[str, list]]:
+        """
+        合并检索：同一关键词只请求一次，结果按索引器拆分后供本轮其它站点复用，
+        各请求目标按能力生成的检索请求不同时分组请求
+        :return: 索引器 id -> 记录列表，只包含请求成功的分组，全部失败返回 None
+        """
+        batch_key = SearchCache.make_key("*", keyword, categories, page)
+        for key in [key for key, batch in self._batches.items() if batch.expired]:
+            self._batches.pop(key, None)
+        batch = self._batches.get(batch_key)
+        if batch:
+            return await batch.wait(timeout=self._batch_wait_timeout)
+        batch = SearchBatch(ttl=self._batch_ttl)
+        self._batches[batch_key] = batch
+
+        buckets = None
+        try:
+            targets = self._batch_targets(indexer_id)
+            groups: Dict[tuple, Tuple[SearchQuery, List[int], List[str]]] = {}
+            # 不支持该检索的目标直接记为无结果
+            unsupported = []
+            for target in targets:
+                plan = self._plan(target, keyword, mtype, categories)
+                if not plan:
+                    unsupported.append(target)
+                    continue
+                query, search_categories = plan
+                groups.setdefault((query.key, tuple(search_categories)), (query, search_categories, []))[2].append(target)
+            logger.info(f"【{self.plugin_name}】开始合并检索 {', '.join(targets)}，关键词：\"{keyword}\"，"
+                        f"分 {len(groups)} 组请求")
+
+            def request(query: SearchQuery, search_categories: List[int], group: List[str]):
+                metric_key = group[0] if len(group) == 1 else "batch"
+                return self._engine.hedge(lambda: self._request(group, query, search_categories, page,
+                                                                metric_key=metric_key),
+                                          delay=self._hedge_delay(metric_key))
+
+            responses = await asyncio.gather(*[request(*group) for group in groups.values()])
+            if not groups or any(items is not None for items in responses):
+                buckets = {key: [] for target in unsupported for key in self._batch_members(target)}
+                records = []
+                for (_, _, group), items in zip(groups.values(), responses):
+                    if items is not None:
+                        members = [key for target in group for key in self._batch_members(target)]
+                        buckets.update({key: [] for key in members})
+                        self._on_page(members, keyword, categories, page, len(items))
+                        records.extend(items)
+                # 去重后同一资源只保留在做种数最多的索引器下
+                records = self._dedup_items(records)
+                for record in records:
+                    buckets.setdefault(record.indexer, []).append(record)
+                logger.info(f"【{self.plugin_name}】合并检索关键词：\"{keyword}\" 返回数据：{len(records)} 条")
+                if self._cache:
+                    for key, torrents in buckets.items():
+                        self._cache.set(SearchCache.make_key(key, keyword, categories, page), torrents)
+        except Exception as e:
+            logger.error(f"【{self.plugin_name}】合并检索出错：{str(e)}\n{traceback.format_exc()}")
+        finally:
+            batch.resolve(buckets)
+            if buckets is None and self._batches.get(batch_key) is batch:
+                # 失败的合并检索不保留，各站点退回单独检索
+                self._batches.pop(batch_key, None)
+        return buckets
+
+    async def _request(self, targets: List[str], query: SearchQuery, categories: List[int], page: int,
+                       metric_key: str) -> Optional[list]:
+        """
+        向上游发起一次检索请求并解析结果
+        :param targets: 请求的索引器 id，合并检索时可能有多个
+        :param metric_key: 记录检索指标使用的索引器标识
+        :return: 记录列表，请求失败或数据格式异常返回 None
+        """
+        raise NotImplementedError
+
+    def _batch_targets(self, indexer_id: str) -> List[str]:
+        """
+        合并检索的请求目标，默认为全部未熔断的索引器
+        """
+        targets = [key for key in self._indexer_keys() if not self._breaker or self._breaker.allow(key)]
+        if indexer_id not in targets:
+            targets.append(indexer_id)
+        return targets
+
+    def _batch_members(self, target: str) -> List[str]:
+        """
+        合并检索请求目标覆盖的索引器
+        """
+        return [target]
+
+    def _on_page(self, indexer_ids: List[str], keyword: str, categories: List[int], page: int, count: int):
+        """
+        上游返回一页结果后调用，count 为该请求去重前的条数，合并检索时为所在分组的条数
+        """
+
+    async def _take_prefetched(self, cache_key: tuple) -> Optional[list]:
+        """
+        取出后台预取的页，未预取时返回 None
+        """
+        return None
+
+    def _prefetch(self, indexer_id: str, keyword: str, categories: List[int], query: SearchQuery,
+                  search_categories: List[int], page: int, count: int):
+        """
+        单独检索完成后在后台预取后续页，count 为本页去重前的条数，默认不预取
+        """
+
+    def _dedup_items(self, items: list) -> list:
+        """
+        按 infohash、标题 + 大小对记录列表去重，未开启去重时原样返回
+        """
+        if not self._dedup or not items:
+            return items
+        return TorrentDeduplicator.dedup(items, infohash=lambda record: record.infohash)
+
+    def _plan(self, indexer_id: str, keyword: str, mtype: Optional[MediaType],
+              categories: List[int]) -> Optional[Tuple[SearchQuery, List[int]]]:
+        """
+        按索引器能力生成检索请求与分类，索引器不支持该检索时返回 None，未获取到能力时按关键词检索
+        """
+        caps = self._caps.get(indexer_id)
+        query = SearchQuery.plan(keyword, mtype, caps)
+        if not caps:
+            return query, categories
+        categories = caps.filter_categories(categories)
+        if not categories or not caps.supports(query.mode):
+            return None
+        return query, categories
+
+    def _caps_keys(self) -> List[str]:
+        """
+        需要获取能力的索引器
+        """
+        return self._indexer_keys()
+
+    def __refresh_caps(self):
+        """
+        获取缺失或过期的索引器能力，随索引器列表刷新执行，检索时不再请求
+        """
+        if not self._engine or not self._engine.running:
+            return
+        stale = [key for key in self._caps_keys() if key not in self._caps or self._caps[key].expired(self._caps_ttl)]
+        if not stale:
+            return
+        try:
+            fetched = self._engine.run(self._fetch_all_caps(stale), timeout=self._run_timeout())
+        except Exception as e:
+            logger.error(f"【{self.plugin_name}】获取 Indexer 能力出错：{str(e)}")
+            return
+        fetched = {key: caps for key, caps in fetched.items() if key in stale}
+        if fetched:
+            self._caps.update(fetched)
+            self.__save_caps()
+        logger.info(f"【{self.plugin_name}】已更新 Indexer 能力：{len(fetched)}/{len(stale)} 个")
+
+    async def _fetch_all_caps(self, indexers: List[str]) -> Dict[str, IndexerCaps]:
+        """
+        获取索引器能力
+        :param indexers: 缺失或过期的索引器
+        :return: indexer id -> 能力，获取失败的索引器不包含在内
+        """
+        raise NotImplementedError
+
+    def _hedge_delay(self, key: str) -> Optional[float]:
+        """
+        对冲请求的等待时间：索引器最近的 P95 延迟，未开启或样本不足时不对冲
+        """
+        if not self._hedge_requests or not self._metrics:
+            return None
+        return self._metrics.percentile(key, 0.95, min_samples=self._adaptive_min_samples)
+
+    async def __gather_until_deadline(self, coros: List[Coroutine], label: str) -> list:
+        """
+        并发执行各关键词的检索，超出检索时限时取消未完成的请求，只合并已完成关键词的结果，开启去重时合并后去重
+        """
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        done, pending = await asyncio.wait(tasks, timeout=self._search_deadline or None)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"【{self.plugin_name}】{label} 超出检索时限 {self._search_deadline}s，"
+                           f"{len(pending)}/{len(tasks)} 个关键词未完成，返回已获取的结果")
+        results = []
+        for task in tasks:
+            if task in done and task.exception() is None:
+                results.extend(task.result())
+        if self._dedup and len(tasks) > 1:
+            unique = TorrentDeduplicator.dedup(results, infohash=lambda record: record.infohash)
+            if len(unique) < len(results):
+                logger.info(f"【{self.plugin_name}】{label} 合并关键词结果去重：{len(results)} -> {len(unique)} 条")
+            results = unique
+        return results
+
+    def _request_timeout(self, key: str) -> float:
+        """
+        按索引器最近的 P95 延迟计算请求超时，样本不足时使用配置的超时
+        """
+        p95 = self._metrics.percentile(key, 0.95, min_samples=self._adaptive_min_samples) if self._metrics else None
+        if p95 is None:
+            return self._timeout
+        return round(min(self._timeout, max(self._min_timeout, p95 * self._timeout_factor)), 1)
+
+    def _record_health(self, indexer_id: str, ok: bool):
+        """
+        更新索引器熔断状态
+        """
+        if not self._breaker:
+            return
+        change = self._breaker.record(indexer_id, ok)
+        if change == "open":
+            logger.warning(f"【{self.plugin_name}】Indexer：{indexer_id} 连续 {self._breaker.threshold} 次请求失败，"
+                           f"暂停检索，后台探测恢复后重新启用")
+        elif change == "closed":
+            logger.info(f"【{self.plugin_name}】Indexer：{indexer_id} 已恢复，重新参与检索")
+
+    def __probe_indexers(self):
+        """
+        后台探测已到达探测时间的熔断索引器
+        """
+        if not self._breaker or not self._engine or not self._engine.running:
+            return
+        indexers = self._breaker.due()
+        if not indexers:
+            return
+        logger.info(f"【{self.plugin_name}】开始探测熔断的 Indexer：{', '.join(indexers)}")
+        try:
+            self._engine.run(self.__probe_all(indexers), timeout=self._run_timeout())
+        except Exception as e:
+            logger.error(f"【{self.plugin_name}】探测 Indexer 出错：{str(e)}")
+
+    async def __probe_all(self, indexers: List[str]):
+        await asyncio.gather(*[self.__probe(indexer) for indexer in indexers], return_exceptions=True)
+
+    async def __probe(self, indexer_id: str):
+        """
+        使用空关键词检索探测索引器是否恢复
+        """
+        body = await self.__ping(indexer_id)
+        self._record_health(indexer_id, body is not None)
+
+    def _ping_url(self, indexer_id: str) -> str:
+        """
+        探测与健康检查使用的空关键词检索地址，只请求一条结果
+        """
+        raise NotImplementedError
+
+    def _search_headers(self) -> dict:
+        """
+        检索请求头
+        """
+        return {"User-Agent": settings.USER_AGENT}
+
+    async def __ping(self, indexer_id: str) -> Optional[bytes]:
+        """
+        使用空关键词检索请求一次索引器，并记录健康状态
+        :return: 响应内容，请求失败返回 None
+        """
+        trace = RequestTrace()
+        body = await self._engine.fetch(self._ping_url(indexer_id),
+                                        headers=self._search_headers(),
+                                        timeout=self._request_timeout(indexer_id),
+                                        trace=trace,
+                                        rate_keys=[indexer_id])
+        if self._health:
+            self._health.record(indexer_id, "ok" if body is not None else "error", latency=trace.elapsed,
+                                error=None if body is not None
+                                else f"HTTP {trace.status}" if trace.status and trace.status >= 400 else trace.error)
+        return body
+
+    def __check_health(self):
+        """
+        后台健康检查：并发探测全部索引器，已熔断的索引器由熔断探测负责，不再重复请求
+        """
+        if not self._engine or not self._engine.running or not self._indexers:
+            return
+        keys = self._indexer_keys()
+        try:
+            self._engine.run(self.__check_all(keys), timeout=self._run_timeout())
+        except Exception as e:
+            logger.error(f"【{self.plugin_name}】健康检查出错：{str(e)}")
+            return
+        snapshot = self._health.snapshot()
+        healthy = sum(1 for key in keys if snapshot.get(key, {}).get("status") == "ok")
+        logger.info(f"【{self.plugin_name}】健康检查完成：{healthy}/{len(keys)} 个 Indexer 正常")
+
+    async def __check_all(self, keys: List[str]):
+        async def check(key: str):
+            if self._breaker and not self._breaker.allow(key):
+                self._health.record(key, "open")
+                return
+            await self.__ping(key)
+
+        await asyncio.gather(*[check(key) for key in keys], return_exceptions=True)
+
+    def _create_session(self) -> requests.Session:
+        """
+        创建带连接池、长连接与重试策略的会话
+        """
+        retry = Retry(total=self._max_retries,
+                      connect=self._max_retries,
+                      read=0,
+                      backoff_factor=self._retry_backoff,
+                      status_forcelist=(429, 502, 503, 504),
+                      allowed_methods=frozenset(["GET"]),
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=self._pool_connections,
+                              pool_maxsize=max(self._pool_maxsize, self._search_workers),
+                              max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @staticmethod
+    def _to_int(value: Any, default: int) -> int:
+        """
+        将配置项转换为整数，非法值使用默认值
+        """
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    @staticmethod
+    def get_cat(mtype: Optional[MediaType] = None):
+        if not mtype:
+            return [2000, 5000]
+        elif mtype == MediaType.MOVIE:
+            return [2000]
+        elif mtype == MediaType.TV:
+            return [5000]
+        else:
+            return [2000, 5000]
+
+    def get_module(self) -> Dict[str, Any]:
+        """
+        获取插件模块声明，用于胁持系统模块实现（方法名：方法实现）
+        {
+            "id1": self.xxx1,
+            "id2": self.xxx2,
+        }
+        """
+        return {
+            "search_torrents": self.search_torrents,
+        }
+
+    def get_api(self) -> List[Dict[str, Any]]:
+        """
+        获取插件API
+        [{
+            "path": "/xx",
+            "endpoint": self.xxx,
+            "methods": ["GET", "POST"],
+            "summary": "API说明"
+        }]
+        """
+        return [{
+            "path": "/metrics",
+            "endpoint": self.get_metrics,
+            "methods": ["GET"],
+            "auth": "bear",
+            "summary": "索引器检索指标",
+            "description": "各索引器的请求延迟分布、流量、解析耗时、结果数及错误、超时率"
+        }]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        索引器检索指标
+        """
+        names = {indexer.get("domain", "").split(".")[-1]: indexer.get("name") for indexer in self._indexers or []}
+        indexers = self._metrics.snapshot() if self._metrics else {}
+        breaker = self._breaker.snapshot() if self._breaker else {}
+        for key, item in indexers.items():
+            item["name"] = names.get(key, key)
+            item["timeout"] = self._request_timeout(key)
+            item["state"] = breaker.get(key, {}).get("state", "closed")
+        return {
+            "indexers": indexers,
+            "breaker": breaker,
+            "caps": {key: caps.to_dict() for key, caps in self._caps.items()},
+            "health": self._health.snapshot() if self._health else {},
+            "limiter": self._limiter.stats() if self._limiter else {},
+            "inflight": self._inflight.stats() if self._inflight else {},
+            "cache": self._cache.stats() if self._cache else {}
+        }
+
+    def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
+        """
+        拼装插件配置页面，需要返回两块数据：1、页面配置；2、数据结构
+        """
+        form_rows, defaults = self._form()
+        return [
+            {
+                'component': 'VForm',
+                'content': [
+                    *form_rows,
+                    *self.__tuning_rows(),
+                    *self.__notice_rows()
+                ]
+            }
+        ], {
+            "enabled": False,
+            "proxy": False,
+            "host": "",
+            "api_key": "",
+            "cron": "0 0 */24 * *",
+            "onlyonce": False,
+            "search_workers": 16,
+            "timeout": 60,
+            "breaker_threshold": 3,
+            "breaker_cooldown": 300,
+            "search_deadline": 0,
+            "hedge_requests": False,
+            "health_interval": 15,
+            "rate_limit": 0,
+            "host_rate_limit": 0,
+            "dedup": False,
+            "cache_ttl": 300,
+            "cache_max_entries": 500,
+            "cache_max_mb": 32,
+            **defaults
+        }
+
+    def _form(self) -> Tuple[List[dict], Dict[str, Any]]:
+        """
+        插件开关、连接信息等各插件自有的配置行及其默认值，位于公共的缓存、超时、限流配置之前
+        """
+        raise NotImplementedError
+
+    def __tuning_rows(self) -> List[dict]:
+        """
+        缓存、超时与熔断、检索时限、健康检查与限流配置
+        """
+        return [
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'cache_ttl',
+                                    'label': '结果缓存时间（秒）',
+                                    'placeholder': '300',
+                                    'type': 'number',
+                                    'hint': '相同索引器、关键词、分类和页码的检索结果缓存时长，0为不缓存'
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'cache_max_entries',
+                                    'label': '缓存最大条目数',
+                                    'placeholder': '500',
+                                    'type': 'number',
+                                    'hint': '超出后淘汰最久未使用的缓存'
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'cache_max_mb',
+                                    'label': '缓存内存上限（MB）',
+                                    'placeholder': '32',
+                                    'type': 'number',
+                                    'hint': '缓存估算占用超出后淘汰最久未使用的缓存'
+                                }
+                            }
+                        ]
+                    }
+                ]
+            },
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'timeout',
+                                    'label': '检索超时（秒）',
+                                    'placeholder': '60',
+                                    'type': 'number',
+                                    'hint': '单次检索请求的最长等待时间，索引器有足够样本后按其P95延迟自动缩短'
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'breaker_threshold',
+                                    'label': '熔断阈值',
+                                    'placeholder': '3',
+                                    'type': 'number',
+                                    'hint': '索引器连续请求失败达到该次数后暂停检索，0为不熔断'
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'breaker_cooldown',
+                                    'label': '熔断探测间隔（秒）',
+                                    'placeholder': '300',
+                                    'type': 'number',
+                                    'hint': '熔断后在后台探测索引器是否恢复的间隔，探测失败时逐次翻倍'
+                                }
+                            }
+                        ]
+                    }
+                ]
+            },
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'search_deadline',
+                                    'label': '检索时限（秒）',
+                                    'placeholder': '0',
+                                    'type': 'number',
+                                    'hint': '单个站点一次检索的最长耗时，到时返回已完成关键词的结果，未完成的请求被取消，0为不限制'
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VSwitch',
+                                'props': {
+                                    'model': 'hedge_requests',
+                                    'label': '对冲请求',
+                                    'hint': '请求超过该索引器P95延迟仍未返回时再发起一次相同请求，取先返回的结果'
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VSwitch',
+                                'props': {
+                                    'model': 'dedup',
+                                    'label': '结果去重',
+                                    'hint': '按infohash或标题+大小合并重复资源，只保留做种数最多的一份'
+                                }
+                            }
+                        ]
+                    }
+                ]
+            },
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'health_interval',
+                                    'label': '健康检查间隔（分钟）',
+                                    'placeholder': '15',
+                                    'type': 'number',
+                                    'hint': '在后台定期以只取一条结果的检索探测各索引器的可用性与延迟，结果显示在详情页，0为不检查'
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'rate_limit',
+                                    'label': '索引器限速（次/分钟）',
+                                    'placeholder': '0',
+                                    'type': 'number',
+                                    'hint': '每个索引器每分钟最多发起的请求数，超出的请求排队等待，0为不限速'
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'host_rate_limit',
+                                    'label': f'{self._backend}限速（次/秒）',
+                                    'placeholder': '0',
+                                    'type': 'number',
+                                    'hint': '每个主机每秒最多发起的请求数，检索与刷新索引器共用，超出的请求排队等待，0为不限速'
+                                }
+                            }
+                        ]
+                    }
+                ]
+            }
+        ]
+
+    def __notice_rows(self) -> List[dict]:
+        return [
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                        },
+                        'content': [
+                            {
+                                'component': 'VAlert',
+                                'props': {
+                                    'type': 'success',
+                                    'variant': 'tonal',
+                                    'text': '将“查看数据”列表中 “站点domain” => 站点管理 新增站点 站点名+ https://或http:// 直接新增'}
+                            }
+                        ]
+                    }
+                ]
+            },
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                        },
+                        'content': [
+                            {
+                                'component': 'VAlert',
+                                'props': {
+                                    'type': 'info',
+                                    'variant': 'tonal',
+                                    'text': '该种方式扩建检索，无法进行站点连通性监测，官方默认方式添加的正常不影响！'
+                                            '日志出现报如下错误时，可以不用管，由于插件没有检索到数据会触发后续模块检索，导致错误'
+                                            f'indexer - 【{self.plugin_name}】ACG.RIP 搜索出错：NoneType object has no attribute get'
+                                }
+                            }
+                        ]
+                    }
+                ]
+            }
+        ]
+
+    def __cache_stats_row(self) -> dict:
+        """
+        检索结果缓存统计
+        """
+        stats = self._cache.stats() if self._cache else {}
+        if not self._cache or not self._cache.enabled:
+            text = "检索结果缓存：未启用"
+        else:
+            text = (f"检索结果缓存：{stats.get('entries')} 条，"
+                    f"约 {round(stats.get('bytes') / 1024 / 1024, 2)} MB，"
+                    f"命中 {stats.get('hits')} 次，未命中 {stats.get('misses')} 次，"
+                    f"命中率 {stats.get('hit_rate')}%，淘汰 {stats.get('evictions')} 次")
+        return {
+            'component': 'VRow',
+            'content': [
+                {
+                    'component': 'VCol',
+                    'props': {
+                        'cols': 12,
+                    },
+                    'content': [
+                        {
+                            'component': 'VAlert',
+                            'props': {
+                                'type': 'info',
+                                'variant': 'tonal',
+                                'text': text
+                            }
+                        }
+                    ]
+                }
+            ]
+        }
+
+    def __metrics_row(self) -> Optional[dict]:
+        """
+        索引器检索指标汇总表，按 P95 延迟降序
+        """
+        indexers = self.get_metrics().get("indexers")
+        if not indexers:
+            return None
+        headers = ['索引器', '状态', '请求数', '平均延迟', 'P50', 'P95', '超时', '错误率', '超时率', '平均结果数',
+                   '平均解析耗时', '流量']
+        rows = []
+        for item in sorted(indexers.values(), key=lambda x: x.get("p95") or 0, reverse=True):
+            values = [
+                item.get("name"),
+                '熔断' if item.get("state") == "open" else '正常',
+                item.get("requests"),
+                f"{item.get('avg_latency')}s",
+                f"{item.get('p50')}s",
+                f"{item.get('p95')}s",
+                f"{item.get('timeout')}s",
+                f"{item.get('error_rate')}%",
+                f"{item.get('timeout_rate')}%",
+                item.get("avg_results"),
+                f"{item.get('avg_parse_time')}s",
+                f"{round(item.get('bytes') / 1024 / 1024, 2)} MB",
+            ]
+            rows.append({
+                'component': 'tr',
+                'content': [{'component': 'td', 'text': value} for value in values]
+            })
+        return {
+            'component': 'VRow',
+            'content': [
+                {
+                    'component': 'VCol',
+                    'props': {
+                        'cols': 12
+                    },
+                    'content': [
+                        {
+                            'component': 'VTable',
+                            'props': {
+                                'hover': True
+                            },
+                            'content': [
+                                {
+                                    'component': 'thead',
+                                    'content': [
+                                        {
+                                            'component': 'tr',
+                                            'content': [
+                                                {
+                                                    'component': 'th',
+                                                    'props': {
+                                                        'class': 'text-start ps-4'
+                                                    },
+                                                    'text': header
+                                                } for header in headers
+                                            ]
+                                        }
+                                    ]
+                                },
+                                {
+                                    'component': 'tbody',
+                                    'content': rows
+                                }
+                            ]
+                        }
+                    ]
+                }
+            ]
+        }
+
+    def get_page(self) -> List[dict]:
+        """
+        拼装插件详情页面，需要返回页面配置，同时附带数据
+        """
+        # 详情页只读取内存中的快照，不发起网络请求
+        if not self._enabled or not self._host or not self._api_key:
+            return [
+                {
+                    'component': 'VAlert',
+                    'props': {
+                        'type': 'warning',
+                        'variant': 'tonal',
+                        'text': f'插件未启用或未配置 {self._backend} 地址与 API Key'
+                    }
+                }
+            ]
+        if not self._indexers:
+            if self._scheduler and self._scheduler.running:
+                # 索引器列表尚未加载，在后台刷新
+                self._scheduler.add_job(self.get_status, 'date', id="refresh_on_page", replace_existing=True,
+                                        run_date=datetime.now(tz=pytz.timezone(settings.TZ)))
+            return [
+                {
+                    'component': 'VAlert',
+                    'props': {
+                        'type': 'info',
+                        'variant': 'tonal',
+                        'text': '索引器列表加载中，请稍后刷新'
+                    }
+                }
+            ]
+
+        health = self._health.snapshot() if self._health else {}
+        items = []
+        for site in self._indexers:
+            checked = health.get(site.get("domain", "").split(".")[-1]) or {}
+            items.append({
+                'component': 'tr',
+                'content': [
+                    {
+                        'component': 'td',
+                        'text': site.get("id")
+                    },
+                    {
+                        'component': 'td',
+                        'text': f"https://{site.get('domain')}"
+                    },
+                    {
+                        'component': 'td',
+                        'text': site.get("public")
+                    },
+                    {
+                        'component': 'td',
+                        'text': {'ok': '正常', 'error': f"异常 {checked.get('error') or ''}".strip(),
+                                 'open': '熔断'}.get(checked.get("status"), '未检查')
+                    },
+                    {
+                        'component': 'td',
+                        'text': f"{checked.get('latency')}s" if checked.get("latency") is not None else '-'
+                    },
+                    {
+                        'component': 'td',
+                        'text': checked.get("checked_at") or '-'
+                    }
+                ]
+            })
+
+        metrics_row = self.__metrics_row()
+        return [
+            self.__cache_stats_row(),
+            *([metrics_row] if metrics_row else []),
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12
+                        },
+                        'content': [
+                            {
+                                'component': 'VTable',
+                                'props': {
+                                    'hover': True
+                                },
+                                'content': [
+                                    {
+                                        'component': 'thead',
+                                        'content': [
+                                            {
+                                                'component': 'tr',
+                                                'content': [
+                                                    {
+                                                        'component': 'th',
+                                                        'props': {
+                                                            'class': 'text-start ps-4'
+                                                        },
+                                                        'text': 'id'
+                                                    },
+                                                    {
+                                                        'component': 'th',
+                                                        'props': {
+                                                            'class': 'text-start ps-4'
+                                                        },
+                                                        'text': '站点domain'
+                                                    },
+                                                    {
+                                                        'component': 'th',
+                                                        'props': {
+                                                            'class': 'text-start ps-4'
+                                                        },
+                                                        'text': '是否公开'
+                                                    },
+                                                    {
+                                                        'component': 'th',
+                                                        'props': {
+                                                            'class': 'text-start ps-4'
+                                                        },
+                                                        'text': '健康状态'
+                                                    },
+                                                    {
+                                                        'component': 'th',
+                                                        'props': {
+                                                            'class': 'text-start ps-4'
+                                                        },
+                                                        'text': '延迟'
+                                                    },
+                                                    {
+                                                        'component': 'th',
+                                                        'props': {
+                                                            'class': 'text-start ps-4'
+                                                        },
+                                                        'text': '检查时间'
+                                                    }
+                                                ]
+                                            }
+                                        ]
+                                    },
+                                    {
+                                        'component': 'tbody',
+                                        'content': items
+                                    }
+                                ]
+                            }
+                        ]
+                    }
+                ]
+            }
+        ]
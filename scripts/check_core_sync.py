@@ -0,0 +1,55 @@
+"""
+检查各插件目录下共用的检索核心 core.py 是否一致
+
+MoviePilot 按插件目录单独安装插件，JackettExtend 与 ProwlarrExtend 各保留一份 core.py，
+修改其中一份后需同步另一份，提交前运行本脚本确认：
+
+用法：
+    python scripts/check_core_sync.py
+    python scripts/check_core_sync.py --sync jackettextend   # 以 jackettextend 的副本覆盖其它副本
+"""
+import argparse
+import difflib
+import shutil
+import sys
+from pathlib import Path
+
+PLUGINS_DIR = Path(__file__).resolve().parent.parent / "plugins.v2"
+# 共用 core.py 的插件目录
+SHARED = ["jackettextend", "prowlarrextend"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sync", choices=SHARED, help="以该插件目录的 core.py 覆盖其它副本")
+    args = parser.parse_args()
+
+    if args.sync:
+        source = PLUGINS_DIR / args.sync / "core.py"
+        for name in SHARED:
+            if name != args.sync:
+                shutil.copyfile(source, PLUGINS_DIR / name / "core.py")
+        print(f"已将 {args.sync}/core.py 同步到 {', '.join(name for name in SHARED if name != args.sync)}")
+        return 0
+
+    base = PLUGINS_DIR / SHARED[0] / "core.py"
+    expected = base.read_text(encoding="utf-8")
+    drifted = []
+    for name in SHARED[1:]:
+        path = PLUGINS_DIR / name / "core.py"
+        actual = path.read_text(encoding="utf-8")
+        if actual == expected:
+            continue
+        drifted.append(name)
+        sys.stdout.writelines(difflib.unified_diff(expected.splitlines(keepends=True),
+                                                   actual.splitlines(keepends=True),
+                                                   fromfile=f"{SHARED[0]}/core.py", tofile=f"{name}/core.py"))
+    if drifted:
+        print(f"\ncore.py 副本不一致：{', '.join(drifted)}，修改后请运行 --sync 同步")
+        return 1
+    print(f"core.py 副本一致：{', '.join(SHARED)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+检查 JackettExtend 的 torznab 解析结果：解析 benchmarks 生成的 Jackett 检索响应，逐条核对各字段，
+防止 size、grabs 等以子节点返回的字段或 torznab:attr 映射被遗漏
+
+插件依赖 MoviePilot 的 app 包，需通过 --moviepilot 参数或 MOVIEPILOT_PATH 环境变量指定 MoviePilot 源码目录
+
+用法：
+    python scripts/check_torznab_parser.py --moviepilot /path/to/MoviePilot
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import load_plugin, torznab_response  # noqa: E402
+
+
+def expected(i: int, indexer_id: str) -> dict:
+    """
+    与 benchmarks.common.torznab_item 生成的第 i 条结果对应的字段
+    """
+    return {
+        "indexer": indexer_id,
+        "infohash": f"{i:040x}",
+        "title": f"Example.Movie.{2000 + i % 25}.2160p.WEB-DL.DDP5.1.Atmos.H.265-GROUP{i}",
+        "enclosure": f"http://127.0.0.1:9117/dl/{indexer_id}/?jackett_apikey=k&path=abcdef{i}",
+        "description": f"Example movie release {i}",
+        "page_url": f"https://tracker.example/details.php?id={100000 + i}",
+        "size": 1073741824 + i * 4096,
+        "seeders": i % 300,
+        "peers": i % 300 + i % 50,
+        "grabs": i % 500,
+        "imdbid": f"tt{1000000 + i}",
+        "downloadvolumefactor": 0.0 if i % 3 == 0 else 1.0,
+        "uploadvolumefactor": 1.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--moviepilot", default=os.environ.get("MOVIEPILOT_PATH"),
+                        help="MoviePilot 源码目录，默认读取 MOVIEPILOT_PATH 环境变量")
+    parser.add_argument("--size", type=int, default=200, help="生成样本的结果条数")
+    args = parser.parse_args()
+
+    module = load_plugin("jackettextend", args.moviepilot)
+    indexer_ids = ["idx0", "idx1"]
+    stream = module.TorznabStreamParser(module.TorrentRecord.from_torznab)
+    body = torznab_response(args.size, indexer_ids)
+    records = []
+    # 按小块喂入，覆盖 item 跨数据块的情况
+    for offset in range(0, len(body), 4096):
+        records.extend(stream.feed(body[offset:offset + 4096]))
+    records.extend(stream.close())
+
+    errors = []
+    if len(records) != args.size:
+        errors.append(f"解析出 {len(records)} 条，应为 {args.size} 条")
+    for i, record in enumerate(records):
+        for key, value in expected(i, indexer_ids[i % len(indexer_ids)]).items():
+            if getattr(record, key) != value:
+                errors.append(f"第 {i} 条 {key} 为 {getattr(record, key)!r}，应为 {value!r}")
+    for error in errors[:20]:
+        print(error)
+    if errors:
+        print(f"torznab 解析结果不一致：共 {len(errors)} 处")
+        return 1
+    print(f"torznab 解析结果一致：{len(records)} 条")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())